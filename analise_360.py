@@ -1,15 +1,128 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from debug_excel import AnalisadorExcel
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
+
+try:
+    from numba import njit
+except ImportError:  # numba é opcional: sem ele o score usa a versão NumPy
+    njit = None
+
+# CSS personalizado do dashboard (montado uma única vez)
+CSS_DASHBOARD = """
+<style>
+.metric-card {
+    background-color: #f8f9fa;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    margin: 0.5rem 0;
+    box-shadow: 0 0.125rem 0.25rem rgba(0,0,0,0.075);
+}
+.ranking-card {
+    background-color: white;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    margin: 0.5rem 0;
+    border-left: 4px solid #1f77b4;
+}
+</style>
+"""
+
+def _mtime(caminho):
+    """Retorna a data de modificação do arquivo (ou None se não configurado)"""
+    return os.path.getmtime(caminho) if caminho else None
+
+# Ranking em cache: a chave inclui o mtime, então arquivos editados invalidam o cache.
+# Devolve também as métricas por colaborador já calculadas, para o overview não reler as planilhas
+@st.cache_data(show_spinner=False)
+def _build_ranking(path_julio, mtime_julio, path_leandro, mtime_leandro):
+    analise = Analise360()
+    if path_julio:
+        analise.analisador_julio = AnalisadorExcel(path_julio)
+    if path_leandro:
+        analise.analisador_leandro = AnalisadorExcel(path_leandro)
+    df_ranking = analise._montar_ranking()
+    colaboradores = {
+        grupo: analisador.colaboradores
+        for grupo, analisador in (('JULIO', analise.analisador_julio), ('LEANDRO', analise.analisador_leandro))
+        if analisador
+    }
+    return df_ranking, colaboradores
+
+# Figuras em cache: Streamlit faz o hash do DataFrame e só reconstrói se os dados mudarem
+@st.cache_data(show_spinner=False)
+def _bar_figs(df_ranking):
+    """Monta os gráficos de score e eficiência com um único agrupamento por grupo"""
+    import plotly.graph_objects as go  # import tardio: uso em lote não paga o custo do plotly
+    layout = {'barmode': 'relative', 'xaxis_title': 'Colaborador', 'legend_title': 'Grupo'}
+    fig_score = go.Figure(layout=go.Layout(title="Comparativo de Score", yaxis_title='Score', **layout))
+    fig_eficiencia = go.Figure(layout=go.Layout(title="Comparativo de Eficiência", yaxis_title='Taxa Eficiência', **layout))
+    for grupo, sub in df_ranking.groupby('Grupo', sort=False, observed=True):
+        colaboradores = sub['Colaborador'].to_numpy()
+        fig_score.add_trace(go.Bar(x=colaboradores, y=sub['Score'].to_numpy(), name=grupo))
+        fig_eficiencia.add_trace(go.Bar(x=colaboradores, y=sub['Taxa Eficiência'].to_numpy(), name=grupo))
+    return fig_score, fig_eficiencia
+
+@st.cache_data(show_spinner=False)
+def _pie_fig(df, values, names, title):
+    import plotly.express as px
+    return px.pie(df, values=values, names=names, title=title)
+
+def _status_totals(distribuicao_status):
+    """Retorna (total, pendentes) percorrendo a distribuição de status uma única vez"""
+    total = 0
+    pendente = 0
+    for status, quantidade in distribuicao_status.items():
+        total += quantidade
+        if status == 'PENDENTE':
+            pendente = quantidade
+    return total, pendente
+
+def _calcular_scores(taxa, total, pendente, tempo, slope):
+    """Versão vetorizada de calcular_score sobre os arrays de todos os colaboradores"""
+    # Fator 1: Taxa de eficiência (peso 40%)
+    score = taxa * 40
+    
+    # Fator 2: Volume processado (peso 20%)
+    score += (total - pendente) / total * 20
+    
+    # Fator 3: Tempo médio de resolução (peso 20%) - tempo 0 indica ausência do dado
+    score += np.where(tempo != 0, np.maximum(0, 10 - tempo) / 10 * 20, 0)
+    
+    # Fator 4: Tendência de melhoria (peso 20%)
+    score += (slope > 0) * 20
+    
+    return score
+
+def _score_kernel(taxa, total, pendente, tempo, slope):
+    """Mesmo cálculo de _calcular_scores em um único laço, para compilação com numba"""
+    n = taxa.shape[0]
+    score = np.empty(n)
+    for i in range(n):
+        s = taxa[i] * 40.0 + (total[i] - pendente[i]) / total[i] * 20.0
+        t = tempo[i]
+        if t != 0.0 and t < 10.0:
+            s += (10.0 - t) / 10.0 * 20.0
+        if slope[i] > 0:
+            s += 20.0
+        score[i] = s
+    return score
+
+# Com numba, o kernel compilado faz uma única passada sobre os arrays
+if njit is not None:
+    _calcular_scores = njit(cache=True, error_model='numpy')(_score_kernel)
 
 class Analise360:
     def __init__(self):
         self.analisador_julio = None
         self.analisador_leandro = None
+        self.caminho_julio = None
+        self.caminho_leandro = None
+        self._ranking = None
+        self._colaboradores = None
         self.data_atual = datetime.now().date()
         
     def configurar_arquivos(self, arquivos):
@@ -17,8 +130,10 @@ class Analise360:
         for nome, caminho in arquivos.items():
             if 'JULIO' in nome.upper():
                 self.analisador_julio = AnalisadorExcel(caminho)
+                self.caminho_julio = caminho
             elif 'LEANDRO' in nome.upper():
                 self.analisador_leandro = AnalisadorExcel(caminho)
+                self.caminho_leandro = caminho
                 
     def calcular_score(self, metricas):
         """Calcula score baseado em múltiplos fatores"""
@@ -43,51 +158,94 @@ class Analise360:
         
         return score
         
+    def _garantir_analise(self, analisador):
+        """Analisa o arquivo apenas na primeira vez; chamadas seguintes reutilizam os colaboradores"""
+        if not getattr(analisador, '_parsed', False):
+            analisador.analisar_arquivo()
+            analisador._parsed = True
+        
     def gerar_ranking(self):
-        """Gera ranking geral dos colaboradores"""
-        ranking = []
+        """Gera ranking geral dos colaboradores (com cache entre reruns)"""
+        df_ranking, colaboradores = _build_ranking(
+            self.caminho_julio, _mtime(self.caminho_julio),
+            self.caminho_leandro, _mtime(self.caminho_leandro)
+        )
+        self._restaurar_colaboradores(colaboradores)
         
-        # Processar grupo JULIO se disponível
-        if self.analisador_julio:
-            try:
-                dados_julio = self.analisador_julio.analisar_arquivo()
-                for colab, metricas in self.analisador_julio.colaboradores.items():
-                    score = self.calcular_score(metricas)
-                    ranking.append({
-                        'Colaborador': colab,
-                        'Grupo': 'JULIO',
-                        'Score': score,
-                        'Taxa Eficiência': metricas['taxa_eficiencia'] * 100,
-                        'Casos Pendentes': metricas['distribuicao_status'].get('PENDENTE', 0),
-                        'Casos Processados': sum(v for k, v in metricas['distribuicao_status'].items() if k != 'PENDENTE'),
-                        'Tempo Médio': metricas.get('tempo_medio_resolucao', 0)
-                    })
-            except Exception as e:
-                st.error(f"Erro ao processar dados do grupo JULIO: {str(e)}")
-            
-        # Processar grupo LEANDRO se disponível
-        if self.analisador_leandro:
+        # Guardar scores indexados para o overview não recalcular
+        if not df_ranking.empty:
+            self._ranking = df_ranking.set_index(['Grupo', 'Colaborador'])
+        return df_ranking
+
+    def _restaurar_colaboradores(self, colaboradores):
+        """Preenche os analisadores da instância com as métricas em cache (marcados como já analisados)"""
+        self._colaboradores = colaboradores
+        for grupo, analisador in (('JULIO', self.analisador_julio), ('LEANDRO', self.analisador_leandro)):
+            if analisador and grupo in colaboradores:
+                analisador.colaboradores = colaboradores[grupo]
+                analisador._parsed = True
+
+    def _process_group(self, grupo, analisador):
+        """Extrai os fatores de score de cada colaborador do grupo"""
+        linhas = []
+        for colab, metricas in analisador.colaboradores.items():
+            total, pendente = _status_totals(metricas['distribuicao_status'])
+            fatores = (
+                metricas['taxa_eficiencia'],
+                total,
+                pendente,
+                metricas.get('tempo_medio_resolucao') or 0,
+                metricas.get('tendencias', {}).get('slope', 0)
+            )
+            linhas.append((colab, grupo, fatores, metricas.get('tempo_medio_resolucao', 0)))
+        return linhas
+
+    def _montar_ranking(self):
+        """Monta o ranking processando os arquivos configurados"""
+        linhas = []
+        
+        grupos_configurados = [
+            (grupo, analisador)
+            for grupo, analisador in (('JULIO', self.analisador_julio), ('LEANDRO', self.analisador_leandro))
+            if analisador
+        ]
+        
+        # Analisar os arquivos dos grupos em paralelo (I/O + pandas liberam o GIL)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futuros = {
+                grupo: executor.submit(self._garantir_analise, analisador)
+                for grupo, analisador in grupos_configurados
+            }
+        
+        # Processar cada grupo disponível
+        for grupo, analisador in grupos_configurados:
             try:
-                dados_leandro = self.analisador_leandro.analisar_arquivo()
-                for colab, metricas in self.analisador_leandro.colaboradores.items():
-                    score = self.calcular_score(metricas)
-                    ranking.append({
-                        'Colaborador': colab,
-                        'Grupo': 'LEANDRO',
-                        'Score': score,
-                        'Taxa Eficiência': metricas['taxa_eficiencia'] * 100,
-                        'Casos Pendentes': metricas['distribuicao_status'].get('PENDENTE', 0),
-                        'Casos Processados': sum(v for k, v in metricas['distribuicao_status'].items() if k != 'PENDENTE'),
-                        'Tempo Médio': metricas.get('tempo_medio_resolucao', 0)
-                    })
+                futuros[grupo].result()
+                linhas.extend(self._process_group(grupo, analisador))
             except Exception as e:
-                st.error(f"Erro ao processar dados do grupo LEANDRO: {str(e)}")
+                st.error(f"Erro ao processar dados do grupo {grupo}: {str(e)}")
         
-        if not ranking:
+        if not linhas:
             st.warning("⚠️ Nenhum arquivo de análise foi carregado ou os arquivos não contêm dados válidos")
             return pd.DataFrame()
-            
-        return pd.DataFrame(ranking).sort_values('Score', ascending=False)
+        
+        colaboradores, grupos, fatores, tempos = zip(*linhas)
+        
+        # Score de todos os colaboradores de uma vez
+        taxa, total, pendente, tempo, slope = np.asarray(fatores, dtype=np.float64).T
+        score = _calcular_scores(taxa, total, pendente, tempo, slope)
+        
+        # Ordenar os arrays antes de montar o DataFrame (colunar)
+        order = np.argsort(-score, kind='stable')
+        return pd.DataFrame({
+            'Colaborador': np.asarray(colaboradores, dtype=object)[order],
+            'Grupo': pd.Categorical(np.asarray(grupos, dtype=object)[order], categories=['JULIO', 'LEANDRO']),
+            'Score': score[order],
+            'Taxa Eficiência': taxa[order] * 100,
+            'Casos Pendentes': pendente[order].astype(np.int64),
+            'Casos Processados': (total - pendente)[order].astype(np.int64),
+            'Tempo Médio': np.asarray(tempos, dtype=np.float64)[order]
+        })
     
     def overview_colaborador(self, colaborador, grupo):
         """Gera overview detalhado de um colaborador"""
@@ -101,13 +259,22 @@ class Analise360:
             st.error(f"Analisador para o grupo {grupo} não está configurado")
             return None
             
-        metricas = analisador.colaboradores.get(colaborador)
+        # Métricas já calculadas pelo ranking em cache (sem analisar a planilha de novo)
+        if self._colaboradores is None:
+            self.gerar_ranking()
+        metricas = self._colaboradores.get(grupo, {}).get(colaborador)
         if not metricas:
             st.error(f"Colaborador {colaborador} não encontrado no grupo {grupo}")
             return None
             
+        # Reaproveitar o score já calculado no ranking, se disponível
+        if self._ranking is not None and (grupo, colaborador) in self._ranking.index:
+            score = self._ranking.loc[(grupo, colaborador), 'Score']
+        else:
+            score = self.calcular_score(metricas)
+            
         # Dados diários (hoje)
-        hoje = {status: 0 for status in metricas['distribuicao_status'].keys()}
+        hoje = dict.fromkeys(metricas['distribuicao_status'], 0)
         
         # Dados gerais
         geral = metricas['distribuicao_status']
@@ -120,8 +287,8 @@ class Analise360:
             'Relatório Geral': geral,
             'Métricas Adicionais': {
                 'Taxa de Eficiência': metricas['taxa_eficiencia'] * 100,
-                'Tempo Médio de Resolução': metricas.get('tempo_medio_resolucao', 0),
-                'Score': self.calcular_score(metricas),
+                'Tempo Médio de Resolução': metricas.get('tempo_medio_resolucao') or 0,
+                'Score': score,
                 'Tendência': 'Crescente' if metricas.get('tendencias', {}).get('slope', 0) > 0 else 'Decrescente'
             }
         }
@@ -132,26 +299,12 @@ class Analise360:
         """Interface principal do dashboard"""
         st.title("📊 Análise 360° de Performance")
         st.write("Visão completa do desempenho dos colaboradores")
+        
+        grupo_selecionado = None
+        colaborador_selecionado = None
 
         # CSS personalizado para melhorar o visual
-        st.markdown("""
-        <style>
-        .metric-card {
-            background-color: #f8f9fa;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            margin: 0.5rem 0;
-            box-shadow: 0 0.125rem 0.25rem rgba(0,0,0,0.075);
-        }
-        .ranking-card {
-            background-color: white;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            margin: 0.5rem 0;
-            border-left: 4px solid #1f77b4;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(CSS_DASHBOARD, unsafe_allow_html=True)
 
         # Verificar se há dados para análise
         if not self.analisador_julio and not self.analisador_leandro:
@@ -163,6 +316,21 @@ class Analise360:
             """)
             return
 
+        # Gerar ranking antes da sidebar: a lista de colaboradores vem das métricas em cache
+        # (reaproveitado da sessão enquanto os arquivos não mudarem)
+        chave_arquivos = (
+            self.caminho_julio, _mtime(self.caminho_julio),
+            self.caminho_leandro, _mtime(self.caminho_leandro)
+        )
+        cache_sessao = st.session_state.get('_ranking_sessao')
+        if cache_sessao and cache_sessao['chave'] == chave_arquivos:
+            df_ranking = cache_sessao['df_ranking']
+            self._ranking = cache_sessao['ranking_indexado']
+            self._restaurar_colaboradores(cache_sessao['colaboradores'])
+        else:
+            df_ranking = self.gerar_ranking()
+            cache_sessao = None
+        
         # Sidebar mais limpa
         with st.sidebar:
             st.header("Filtros")
@@ -180,9 +348,8 @@ class Analise360:
                     grupos_disponiveis
                 )
                 
-                # Obter colaboradores do grupo selecionado
-                analisador = self.analisador_julio if grupo_selecionado == 'JULIO' else self.analisador_leandro
-                colaboradores = list(analisador.colaboradores.keys()) if analisador else []
+                # Obter colaboradores do grupo selecionado (métricas do ranking em cache)
+                colaboradores = list(self._colaboradores.get(grupo_selecionado, {})) if self._colaboradores else []
                 
                 if colaboradores:
                     colaborador_selecionado = st.selectbox(
@@ -195,44 +362,42 @@ class Analise360:
                 st.warning("Nenhum grupo disponível")
                 return
 
-        # Gerar ranking
-        df_ranking = self.gerar_ranking()
-        
         if not df_ranking.empty:
+            if cache_sessao is None:
+                # Formatação vetorizada (evita o Styler célula a célula)
+                df_display = df_ranking.assign(**{
+                    'Score': np.char.mod('%.2f', df_ranking['Score'].to_numpy()),
+                    'Taxa Eficiência': np.char.mod('%.2f%%', df_ranking['Taxa Eficiência'].to_numpy()),
+                    'Tempo Médio': np.char.mod('%.2f', df_ranking['Tempo Médio'].to_numpy())
+                })
+                cache_sessao = {
+                    'chave': chave_arquivos,
+                    'df_ranking': df_ranking,
+                    'ranking_indexado': self._ranking,
+                    'colaboradores': self._colaboradores,
+                    'df_display': df_display,
+                    'figs': _bar_figs(df_ranking)
+                }
+                st.session_state['_ranking_sessao'] = cache_sessao
+            
             # Mostrar ranking geral
             st.header("🏆 Ranking Geral")
-            st.dataframe(
-                df_ranking.style.format({
-                    'Score': '{:.2f}',
-                    'Taxa Eficiência': '{:.2f}%',
-                    'Tempo Médio': '{:.2f}'
-                }),
-                use_container_width=True
-            )
+            st.dataframe(cache_sessao['df_display'], use_container_width=True)
 
             # Gráficos de desempenho
+            fig_score, fig_eficiencia = cache_sessao['figs']
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("📈 Score por Colaborador")
-                fig = px.bar(df_ranking, 
-                           x='Colaborador', 
-                           y='Score',
-                           color='Grupo',
-                           title="Comparativo de Score")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig_score, use_container_width=True)
             
             with col2:
                 st.subheader("🎯 Taxa de Eficiência")
-                fig = px.bar(df_ranking,
-                           x='Colaborador',
-                           y='Taxa Eficiência',
-                           color='Grupo',
-                           title="Comparativo de Eficiência")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig_eficiencia, use_container_width=True)
 
             # Overview do colaborador selecionado
-            if 'colaborador_selecionado' in locals() and 'grupo_selecionado' in locals():
+            if colaborador_selecionado is not None and grupo_selecionado is not None:
                 st.header(f"📋 Overview: {colaborador_selecionado}")
                 overview = self.overview_colaborador(colaborador_selecionado, grupo_selecionado)
                 
@@ -254,17 +419,18 @@ class Analise360:
                     with col3:
                         st.metric(
                             "Tempo Médio de Resolução",
-                            f"{overview['Métricas Adicionais']['Tempo Médio']:.2f} dias"
+                            f"{overview['Métricas Adicionais']['Tempo Médio de Resolução']:.2f} dias"
                         )
                     
                     # Distribuição de status
                     st.subheader("📊 Distribuição de Status")
-                    df_status = pd.DataFrame(list(overview['Relatório Geral'].items()),
-                                          columns=['Status', 'Quantidade'])
-                    fig = px.pie(df_status,
-                               values='Quantidade',
-                               names='Status',
-                               title="Distribuição por Status")
+                    relatorio_geral = overview['Relatório Geral']
+                    df_status = pd.DataFrame({
+                        'Status': list(relatorio_geral),
+                        'Quantidade': list(relatorio_geral.values())
+                    })
+                    df_status['Status'] = df_status['Status'].astype('category')
+                    fig = _pie_fig(df_status, 'Quantidade', 'Status', "Distribuição por Status")
                     st.plotly_chart(fig, use_container_width=True)
         else:
             st.warning("Não foi possível gerar o ranking. Verifique se os arquivos contêm dados válidos.")
@@ -1,466 +1,52 @@
 import pandas as pd
 import numpy as np
-from debug_excel import AnalisadorExcel
-from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
 from datetime import datetime, timedelta
 import warnings
+import logging
 import os
 import json
+import hashlib
+import io
+import string
+from dataclasses import dataclass
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
 warnings.filterwarnings('ignore')
 
-class AnalisadorAvancado:
-    def __init__(self):
-        """Inicializa o analisador avançado"""
-        try:
-            # Inicializar estruturas de dados
-            self.metricas_julio = {}
-            self.metricas_leandro = {}
-            self.gargalos = {}
-            self.ultima_analise = None
-            self.historico_analises = []
-            self.resultados_preditivos = {}
-            
-        except Exception as e:
-            raise RuntimeError(f"Erro ao inicializar analisador: {str(e)}")
+logger = logging.getLogger(__name__)
 
-    def analisar_arquivo(self, caminho_arquivo=None):
-        """Realiza a análise detalhada do arquivo Excel"""
-        if not caminho_arquivo:
-            caminho_arquivo = 'dados_analise.xlsx'
+try:
+    from numba import njit
+except ImportError:  # numba é opcional: sem ele os kernels rodam em Python/NumPy
+    njit = None
 
-        print("Iniciando análise detalhada do arquivo...")
-        
-        try:
-            # Registrar data e hora da análise
-            self.ultima_analise = datetime.now()
-            
-            # Ler todas as abas do arquivo Excel
-            excel_file = pd.ExcelFile(caminho_arquivo)
-            
-            # Lista de colaboradores para processar
-            colaboradores = [
-                'ANA LIDIA', 'FELIPE', 'JULIANE', 'MATHEUS', 'ANA GESSICA', 
-                'POLIANA', 'IGOR', 'ELISANGELA', 'NUNO', 'THALISSON', 
-                'VICTOR ADRIANO', 'VITORIA', 'LEANDRO'
-            ]
-            
-            # Processar cada aba
-            for nome_aba in excel_file.sheet_names:
-                if nome_aba not in colaboradores:
-                    print(f"Pulando aba {nome_aba} - não é um colaborador")
-                    continue
-                    
-                print(f"\nAnalisando dados de: {nome_aba}")
-                
-                try:
-                    # Ler a aba atual
-                    df = pd.read_excel(excel_file, sheet_name=nome_aba)
-                    
-                    # Verificar se temos pelo menos a coluna DATA
-                    if 'DATA' not in df.columns:
-                        print(f"Erro: Coluna DATA não encontrada na aba {nome_aba}")
-                        continue
-                    
-                    # Processar os dados do colaborador
-                    metricas = self.processar_dados_colaborador(nome_aba, df)
-                    
-                    if metricas:
-                        # Adicionar às métricas do grupo apropriado
-                        if nome_aba in ['ANA LIDIA', 'FELIPE', 'JULIANE', 'MATHEUS', 'ANA GESSICA', 'POLIANA', 'IGOR', 'ELISANGELA', 'NUNO', 'THALISSON', 'VICTOR ADRIANO']:
-                            self.metricas_julio[nome_aba] = metricas
-                        else:
-                            self.metricas_leandro[nome_aba] = metricas
-                
-                except Exception as e:
-                    print(f"Erro ao processar aba {nome_aba}: {str(e)}")
-                    continue
+# Diretório do cache Parquet das abas já lidas
+CACHE_DIR = 'cache'
 
-            # Salvar histórico da análise se temos dados
-            if self.metricas_julio or self.metricas_leandro:
-                self.historico_analises.append({
-                    'data': self.ultima_analise,
-                    'metricas_julio': self.metricas_julio.copy(),
-                    'metricas_leandro': self.metricas_leandro.copy()
-                })
+# Colaboradores de cada grupo (abas da planilha)
+_GRUPO_JULIO = frozenset({
+    'ANA LIDIA', 'FELIPE', 'JULIANE', 'MATHEUS', 'ANA GESSICA',
+    'POLIANA', 'IGOR', 'ELISANGELA', 'NUNO', 'THALISSON', 'VICTOR ADRIANO'
+})
+_COLABORADORES = _GRUPO_JULIO | {'VITORIA', 'LEANDRO'}
+# Coluna de cada colaborador no buffer de histórico
+_INDICE_COLABORADOR = {colaborador: i for i, colaborador in enumerate(sorted(_COLABORADORES))}
 
-                # Manter apenas as últimas 10 análises
-                if len(self.historico_analises) > 10:
-                    self.historico_analises = self.historico_analises[-10:]
+# Classe CSS de cada direção de tendência no dashboard
+_CLASSE_TENDENCIA = {'crescente': 'trend-up', 'decrescente': 'trend-down'}
 
-                # Realizar análises comparativas
-                self.analisar_correlacoes()
-                self.detectar_gargalos()
-                self.analisar_tendencias()
-                self.realizar_analise_preditiva()
-                
-                # Gerar o dashboard
-                self.gerar_dashboard_html()
-            else:
-                print("\nNenhum dado válido encontrado para análise")
-            
-        except Exception as e:
-            print(f"Erro ao analisar arquivo: {str(e)}")
-            raise
+# Status dos registros, na ordem dos códigos usados em processar_dados_colaborador
+_STATUS = ('PENDENTE', 'VERIFICADO', 'QUITADO')
 
-    def calcular_correlacao_volume_eficiencia(self):
-        """Calcula a correlação entre volume de casos e eficiência para cada grupo"""
-        print("\n=== Análise de Correlação Volume vs Eficiência ===")
-        
-        resultados = {}
-        for grupo, metricas in [("JULIO", self.metricas_julio), ("LEANDRO", self.metricas_leandro)]:
-            volumes = []
-            eficiencias = []
-            
-            for colab, dados in metricas.items():
-                try:
-                    volume = sum(dados['distribuicao_status'].values())
-                    eficiencia = dados.get('taxa_eficiencia', 0)
-                    if volume > 0:  # Evitar dados inválidos
-                        volumes.append(volume)
-                        eficiencias.append(eficiencia)
-                except (KeyError, TypeError, ValueError) as e:
-                    print(f"Aviso: Dados inválidos para {colab}: {str(e)}")
-                    continue
-            
-            if len(volumes) >= 2:  # Precisamos de pelo menos 2 pontos para correlação
-                try:
-                    correlacao = stats.pearsonr(volumes, eficiencias)
-                    resultados[grupo] = {
-                        'coeficiente': correlacao[0],
-                        'p_valor': correlacao[1]
-                    }
-                    
-                    print(f"\nGrupo {grupo}:")
-                    print(f"Coeficiente de correlação: {correlacao[0]:.3f}")
-                    print(f"P-valor: {correlacao[1]:.3f}")
-                    
-                    if correlacao[1] < 0.05:
-                        if correlacao[0] > 0:
-                            print("=> Correlação positiva significativa: Maior volume está associado a maior eficiência")
-                        else:
-                            print("=> Correlação negativa significativa: Maior volume está associado a menor eficiência")
-                    else:
-                        print("=> Não há correlação significativa entre volume e eficiência")
-                except Exception as e:
-                    print(f"Erro ao calcular correlação para grupo {grupo}: {str(e)}")
-            else:
-                print(f"\nGrupo {grupo}: Dados insuficientes para análise de correlação")
-        
-        return resultados
-    
-    def analisar_correlacoes(self):
-        """Analisa correlações entre diferentes métricas"""
-        try:
-            print("\n=== Análise de Correlações ===")
-            
-            # Analisar correlações para cada grupo
-            for grupo_nome, metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
-                if not metricas:
-                    continue
-                    
-                print(f"\nGrupo {grupo_nome}:")
-                
-                # Coletar dados para análise
-                dados_grupo = []
-                for colaborador, dados in metricas.items():
-                    if not dados:
-                        continue
-                        
-                    total = dados['total_registros']
-                    eficiencia = dados['taxa_eficiencia']
-                    dados_grupo.append({
-                        'colaborador': colaborador,
-                        'total': total,
-                        'eficiencia': eficiencia
-                    })
-                
-                if not dados_grupo:
-                    print("Sem dados suficientes para análise")
-                    continue
-                
-                # Converter para DataFrame
-                df_grupo = pd.DataFrame(dados_grupo)
-                
-                # Calcular correlação entre volume e eficiência
-                if len(df_grupo) > 1:
-                    corr = df_grupo['total'].corr(df_grupo['eficiencia'])
-                    print(f"Correlação volume vs eficiência: {corr:.2f}")
-                    
-                    # Identificar padrões
-                    if abs(corr) > 0.7:
-                        if corr > 0:
-                            print("Forte correlação positiva: maior volume tende a ter maior eficiência")
-                        else:
-                            print("Forte correlação negativa: maior volume tende a ter menor eficiência")
-                    elif abs(corr) > 0.3:
-                        print("Correlação moderada")
-                    else:
-                        print("Correlação fraca: volume e eficiência parecem ser independentes")
-                else:
-                    print("Dados insuficientes para calcular correlações")
-        
-        except Exception as e:
-            print(f"Erro ao analisar correlações: {str(e)}")
-            return None
+# Nomes dos dias na ordem de Series.dt.dayofweek (mesmos rótulos de dt.day_name())
+_DIAS_SEMANA = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
 
-    def detectar_gargalos(self):
-        """Detecta gargalos no processo baseado em diversos indicadores"""
-        try:
-            print("\n=== Detecção de Gargalos ===")
-            
-            self.gargalos = {
-                "Julio": [],
-                "Leandro": []
-            }
-            
-            # Analisar cada grupo
-            for grupo_nome, metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
-                if not metricas:
-                    continue
-                    
-                print(f"\nGrupo {grupo_nome}:")
-                
-                # Calcular métricas médias do grupo
-                total_registros = []
-                taxa_eficiencia = []
-                
-                for dados in metricas.values():
-                    if dados:
-                        total_registros.append(dados['total_registros'])
-                        taxa_eficiencia.append(dados['taxa_eficiencia'])
-                
-                if not total_registros:
-                    continue
-                    
-                media_registros = np.mean(total_registros)
-                media_eficiencia = np.mean(taxa_eficiencia)
-                
-                print(f"Média de registros: {media_registros:.2f}")
-                print(f"Média de eficiência: {media_eficiencia:.2f}")
-                
-                # Identificar colaboradores com métricas significativamente abaixo da média
-                for colaborador, dados in metricas.items():
-                    if not dados:
-                        continue
-                        
-                    # Verificar eficiência
-                    if dados['taxa_eficiencia'] < media_eficiencia * 0.7:
-                        gargalo = {
-                            "colaborador": colaborador,
-                            "tipo": "eficiência",
-                            "valor": dados['taxa_eficiencia'],
-                            "media_grupo": media_eficiencia,
-                            "diferenca_percentual": ((dados['taxa_eficiencia'] / media_eficiencia) - 1) * 100
-                        }
-                        self.gargalos[grupo_nome].append(gargalo)
-                        print(f"⚠️ Gargalo de eficiência detectado: {colaborador} ({dados['taxa_eficiencia']:.2f} vs média {media_eficiencia:.2f})")
-                    
-                    # Verificar volume desproporcional
-                    if dados['total_registros'] > media_registros * 1.5:
-                        gargalo = {
-                            "colaborador": colaborador,
-                            "tipo": "volume",
-                            "valor": dados['total_registros'],
-                            "media_grupo": media_registros,
-                            "diferenca_percentual": ((dados['total_registros'] / media_registros) - 1) * 100
-                        }
-                        self.gargalos[grupo_nome].append(gargalo)
-                        print(f"⚠️ Volume desproporcional detectado: {colaborador} ({dados['total_registros']} vs média {media_registros:.2f})")
-                
-                # Verificar distribuição de carga
-                if len(total_registros) > 1:
-                    cv = np.std(total_registros) / np.mean(total_registros)  # Coeficiente de variação
-                    if cv > 0.5:  # Alta variabilidade
-                        gargalo = {
-                            "tipo": "distribuição",
-                            "valor": cv,
-                            "descricao": "Distribuição desigual de carga entre colaboradores"
-                        }
-                        self.gargalos[grupo_nome].append(gargalo)
-                        print(f"⚠️ Distribuição desigual de carga detectada (CV={cv:.2f})")
-            
-            return self.gargalos
-            
-        except Exception as e:
-            print(f"Erro ao detectar gargalos: {str(e)}")
-            return None
+# Log append-only (um Parquet por análise) do histórico de eficiência
+HISTORICO_DIR = 'historico'
+MAX_HISTORICO = 10
 
-    def prever_tendencias(self):
-        """Analisa tendências e faz previsões simples"""
-        print("\n=== Análise de Tendências e Previsões ===")
-        
-        for grupo, metricas in [("JULIO", self.metricas_julio), ("LEANDRO", self.metricas_leandro)]:
-            print(f"\nGrupo {grupo}:")
-            
-            # Análise de tendências por colaborador
-            for colab, dados in metricas.items():
-                if 'tendencia' in dados:
-                    tendencia = dados['tendencia']
-                    print(f"\nColaborador: {colab}")
-                    
-                    # Interpretar coeficiente angular
-                    slope = tendencia.get('direcao', '')
-                    r2 = tendencia.get('r2', 0)
-                    
-                    if slope == "estável":
-                        tendencia_str = "estável"
-                    elif slope == "crescente":
-                        tendencia_str = "crescente"
-                    else:
-                        tendencia_str = "decrescente"
-                    
-                    print(f"Tendência: {tendencia_str}")
-                    print(f"R² = {r2:.3f}")
-                    
-                    # Fazer previsão para próxima semana
-                    if r2 > 0.3:  # Só fazer previsão se o modelo tiver um ajuste razoável
-                        ultima_eficiencia = dados['taxa_eficiencia']
-                        previsao_proxima_semana = ultima_eficiencia + (slope * 7)  # 7 dias
-                        print(f"Previsão de eficiência para próxima semana: {previsao_proxima_semana*100:.1f}%")
-                        
-                        if previsao_proxima_semana < ultima_eficiencia * 0.8:
-                            print(" Alerta: Possível queda significativa na eficiência")
-                        elif previsao_proxima_semana > ultima_eficiencia * 1.2:
-                            print(" Expectativa de melhoria significativa na eficiência")
-
-    def analisar_tendencias(self):
-        """Analisa tendências nos dados"""
-        try:
-            print("\n=== Análise de Tendências ===")
-            
-            # Analisar tendências para cada grupo
-            for grupo_nome, metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
-                if not metricas:
-                    continue
-                    
-                print(f"\nGrupo {grupo_nome}:")
-                
-                # Analisar tendências por colaborador
-                for colaborador, dados in metricas.items():
-                    if not dados or 'tendencia' not in dados:
-                        continue
-                        
-                    tendencia = dados['tendencia']
-                    print(f"\n{colaborador}:")
-                    print(f"Direção: {tendencia['direcao']}")
-                    print(f"R²: {tendencia['r2']:.3f}")
-                    
-                    # Interpretar a tendência
-                    if tendencia['r2'] > 0.7:
-                        print("Tendência forte e consistente")
-                    elif tendencia['r2'] > 0.3:
-                        print("Tendência moderada")
-                    else:
-                        print("Tendência fraca ou dados muito variáveis")
-        
-        except Exception as e:
-            print(f"Erro ao analisar tendências: {str(e)}")
-            return None
-
-    def realizar_analise_preditiva(self):
-        """
-        Realiza análise preditiva avançada para prever métricas futuras com base em dados históricos.
-        Utiliza modelos de regressão linear e análise de séries temporais para gerar previsões.
-        """
-        print("\n=== Análise Preditiva Avançada ===")
-        
-        # Verificar se temos dados históricos suficientes
-        if len(self.historico_analises) < 2:
-            print("Dados históricos insuficientes para análise preditiva. Necessário pelo menos 2 análises.")
-            return None
-        
-        resultados_preditivos = {
-            "Julio": {},
-            "Leandro": {}
-        }
-        
-        try:
-            # Para cada grupo, realizar previsões
-            for grupo_nome, grupo_metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
-                if not grupo_metricas:
-                    continue
-                
-                print(f"\nPrevisões para grupo {grupo_nome}:")
-                
-                # Para cada colaborador, construir modelo preditivo
-                for colaborador in grupo_metricas.keys():
-                    # Coletar dados históricos deste colaborador
-                    dados_historicos = []
-                    datas = []
-                    
-                    for idx, analise in enumerate(self.historico_analises):
-                        if grupo_nome == "Julio":
-                            metricas_grupo = analise.get('metricas_julio', {})
-                        else:
-                            metricas_grupo = analise.get('metricas_leandro', {})
-                        
-                        if colaborador in metricas_grupo and metricas_grupo[colaborador]:
-                            dados_historicos.append(metricas_grupo[colaborador].get('taxa_eficiencia', 0))
-                            datas.append(idx)  # Usar índice como proxy para tempo
-                    
-                    # Se temos pelo menos 3 pontos de dados, podemos fazer previsão
-                    if len(dados_historicos) >= 3:
-                        # Preparar dados para modelo
-                        X = np.array(datas).reshape(-1, 1)
-                        y = np.array(dados_historicos)
-                        
-                        # Criar e treinar modelo
-                        modelo = LinearRegression()
-                        modelo.fit(X, y)
-                        
-                        # Fazer previsão para próximos 3 períodos
-                        proximos_periodos = np.array([len(datas), len(datas)+1, len(datas)+2]).reshape(-1, 1)
-                        previsoes = modelo.predict(proximos_periodos)
-                        
-                        # Calcular qualidade do modelo
-                        y_pred = modelo.predict(X)
-                        r2 = r2_score(y, y_pred)
-                        
-                        # Armazenar resultados
-                        resultados_preditivos[grupo_nome][colaborador] = {
-                            "historico": dados_historicos,
-                            "previsoes": previsoes.tolist(),
-                            "r2": r2,
-                            "tendencia": "crescente" if modelo.coef_[0] > 0 else "decrescente",
-                            "coeficiente": float(modelo.coef_[0]),
-                            "intercepto": float(modelo.intercept_)
-                        }
-                        
-                        # Exibir resultados
-                        print(f"\n{colaborador}:")
-                        print(f"  Histórico de eficiência: {[f'{x:.2f}' for x in dados_historicos]}")
-                        print(f"  Previsão próximos 3 períodos: {[f'{x:.2f}' for x in previsoes]}")
-                        print(f"  Confiança do modelo (R²): {r2:.2f}")
-                        print(f"  Tendência: {resultados_preditivos[grupo_nome][colaborador]['tendencia']}")
-                        
-                        # Alertas baseados na previsão
-                        ultima_eficiencia = dados_historicos[-1]
-                        proxima_previsao = previsoes[0]
-                        
-                        if proxima_previsao < ultima_eficiencia * 0.8 and r2 > 0.5:
-                            print("  ⚠️ ALERTA: Possível queda significativa na eficiência")
-                        elif proxima_previsao > ultima_eficiencia * 1.2 and r2 > 0.5:
-                            print("  ✅ Expectativa de melhoria significativa na eficiência")
-                    else:
-                        print(f"\n{colaborador}: Dados históricos insuficientes para previsão")
-            
-            # Salvar resultados para uso no dashboard
-            self.resultados_preditivos = resultados_preditivos
-            return resultados_preditivos
-            
-        except Exception as e:
-            print(f"Erro ao realizar análise preditiva: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return None
-
-    def gerar_dashboard_html(self):
-        """Gera um dashboard HTML com os resultados da análise"""
-        
-        # Criar o template HTML com chaves escapadas para estilo CSS
-        html_template = """<!DOCTYPE html>
+# Template HTML do dashboard (chaves escapadas para o estilo CSS)
+HTML_DASHBOARD = """<!DOCTYPE html>
 <html>
 <head>
     <title>Dashboard de Atividades</title>
@@ -554,10 +140,73 @@ class AnalisadorAvancado:
                         
                         <div class="card mt-3">
                             <div class="card-header">
-                                <h5>Comparativo entre Grupos</h5>
+                                <h5>Comparativo entre Grupos</h5>
+                            </div>
+                            <div class="card-body">
+                                <div id="comparativo-grupos"></div>
+                            </div>
+                        </div>
+                    </div>
+                    
+                    <div class="col-md-6">
+                        <div class="card">
+                            <div class="card-header">
+                                <h5>Alertas e Gargalos</h5>
+                            </div>
+                            <div class="card-body">
+                                {alertas_html}
+                            </div>
+                        </div>
+                        
+                        <div class="card mt-3">
+                            <div class="card-header">
+                                <h5>Previsões para Próximo Período</h5>
+                            </div>
+                            <div class="card-body">
+                                <div id="previsoes-resumo"></div>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <!-- Aba do Grupo Julio -->
+            <div class="tab-pane fade" id="julio" role="tabpanel" aria-labelledby="julio-tab">
+                {metricas_julio_html}
+            </div>
+            
+            <!-- Aba do Grupo Leandro -->
+            <div class="tab-pane fade" id="leandro" role="tabpanel" aria-labelledby="leandro-tab">
+                {metricas_leandro_html}
+            </div>
+            
+            <!-- Aba de Previsões -->
+            <div class="tab-pane fade" id="previsoes" role="tabpanel" aria-labelledby="previsoes-tab">
+                <div class="row">
+                    <div class="col-md-12 mb-4">
+                        <div class="card">
+                            <div class="card-header">
+                                <h5>Análise Preditiva</h5>
+                            </div>
+                            <div class="card-body">
+                                <p>Esta seção apresenta previsões baseadas em modelos estatísticos aplicados aos dados históricos. 
+                                As previsões consideram a tendência atual e padrões identificados nas análises anteriores.</p>
+                                
+                                <div class="alert alert-info">
+                                    <strong>Nota:</strong> A confiabilidade das previsões está diretamente relacionada à quantidade 
+                                    de dados históricos disponíveis e à consistência dos padrões observados.
+                                </div>
+                            </div>
+                        </div>
+                    </div>
+                    
+                    <div class="col-md-6">
+                        <div class="card">
+                            <div class="card-header">
+                                <h5>Previsões - Grupo Julio</h5>
                             </div>
                             <div class="card-body">
-                                <div id="comparativo-grupos"></div>
+                                {previsoes_julio_html}
                             </div>
                         </div>
                     </div>
@@ -565,155 +214,825 @@ class AnalisadorAvancado:
                     <div class="col-md-6">
                         <div class="card">
                             <div class="card-header">
-                                <h5>Alertas e Gargalos</h5>
+                                <h5>Previsões - Grupo Leandro</h5>
                             </div>
                             <div class="card-body">
-                                {alertas_html}
+                                {previsoes_leandro_html}
                             </div>
                         </div>
-                        
-                        <div class="card mt-3">
+                    </div>
+                    
+                    <div class="col-md-12 mt-4">
+                        <div class="card">
                             <div class="card-header">
-                                <h5>Previsões para Próximo Período</h5>
+                                <h5>Visualização de Tendências</h5>
                             </div>
                             <div class="card-body">
-                                <div id="previsoes-resumo"></div>
+                                <div id="grafico-previsoes"></div>
                             </div>
                         </div>
                     </div>
                 </div>
             </div>
             
-            <!-- Aba do Grupo Julio -->
-            <div class="tab-pane fade" id="julio" role="tabpanel" aria-labelledby="julio-tab">
-                {metricas_julio_html}
-            </div>
+            <!-- Aba de Histórico -->
+            <div class="tab-pane fade" id="historico" role="tabpanel" aria-labelledby="historico-tab">
+                <div class="card">
+                    <div class="card-header">
+                        <h5>Histórico de Análises</h5>
+                    </div>
+                    <div class="card-body">
+                        {historico_html}
+                    </div>
+                </div>
+            </div>
+        </div>
+    </div>
+    
+    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+    <script>
+        // Scripts para gráficos Plotly
+        {scripts_plotly}
+        
+        // Inicializar tooltips
+        var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'))
+        var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {{
+            return new bootstrap.Tooltip(tooltipTriggerEl)
+        }})
+    </script>
+</body>
+</html>
+"""
+
+# Alertas HTML de gargalos, por tipo (campos do Gargalo em {g})
+_HTML_GARGALO = {
+    'eficiência': (
+        "<div class='alert alert-warning'>"
+        "<strong>{g.colaborador}</strong> - Eficiência abaixo da média do grupo "
+        "({g.valor:.2f}% vs {g.media_grupo:.2f}%)"
+        "</div>"
+    ),
+    'volume': (
+        "<div class='alert alert-warning'>"
+        "<strong>{g.colaborador}</strong> - Volume de trabalho desproporcional "
+        "({g.valor} registros vs média de {g.media_grupo:.0f})"
+        "</div>"
+    ),
+    'distribuição': (
+        "<div class='alert alert-warning'>"
+        "<strong>Grupo {grupo}</strong> - {g.descricao} "
+        "(CV = {g.valor:.2f})"
+        "</div>"
+    )
+}
+
+# Fragmentos HTML das previsões (um por período e um card por colaborador)
+HTML_PREVISAO_PERIODO = """
+                <div class="col-md-4">
+                    <div class="prediction-card p-2 mb-2">
+                        <div class="prediction-date">Período {periodo}</div>
+                        <div class="prediction-value">{prev:.2f}%</div>
+                    </div>
+                </div>
+                """
+
+HTML_PREVISAO_CARD = """
+            <div class="card mb-3">
+                <div class="card-header">
+                    <h6>{colaborador}</h6>
+                </div>
+                <div class="card-body">
+                    <div class="row mb-2">
+                        <div class="col-md-6">
+                            <span class="metric-label">Tendência:</span>
+                            <span class="{classe_tendencia}">
+                                {tendencia}
+                            </span>
+                        </div>
+                        <div class="col-md-6">
+                            <span class="metric-label">Confiança:</span>
+                            <span class="confidence {confianca_class}">{confianca_texto} (R²: {r2:.2f})</span>
+                        </div>
+                    </div>
+                    
+                    <div class="row">
+                        {html_previsoes}
+                    </div>
+                </div>
+            </div>
+            """
+
+# Card de métricas de um colaborador (abas dos grupos)
+HTML_METRICAS_CARD = """
+            <div class="card mb-3">
+                <div class="card-header">
+                    <h5>{colaborador}</h5>
+                </div>
+                <div class="card-body">
+                    <div class="row">
+                        <div class="col-md-3">
+                            <div class="metric-label">Total de Registros</div>
+                            <div class="metric-value">{total_registros}</div>
+                        </div>
+                        <div class="col-md-3">
+                            <div class="metric-label">Taxa de Eficiência</div>
+                            <div class="metric-value">{taxa_eficiencia:.1f}%</div>
+                        </div>
+                        <div class="col-md-3">
+                            <div class="metric-label">Tendência</div>
+                            <div class="metric-value {classe_tendencia}">{tendencia}</div>
+                            <span class="confidence">R²: {r2:.2f}</span>
+                        </div>
+                        <div class="col-md-3">
+                            <div class="metric-label">Distribuição de Status</div>
+                            <div>{distribuicao}</div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            """
+
+# Linha da tabela de histórico de análises
+HTML_HISTORICO_LINHA = """
+                <tr><td>{data:%d/%m/%Y %H:%M}</td><td>{colaboradores}</td><td>{eficiencia_media:.1f}%</td></tr>"""
+
+def _compilar_template(template):
+    """Pré-processa um template str.format em (texto, campo, formato) para não reparsear a cada render"""
+    return tuple(
+        (texto, campo, formato or '')
+        for texto, campo, formato, _ in string.Formatter().parse(template)
+    )
+
+def _escrever_template(arquivo, partes, valores):
+    """Escreve um template pré-processado direto em um arquivo, sem montar a string completa"""
+    for texto, campo, formato in partes:
+        arquivo.write(texto)
+        if campo is not None:
+            arquivo.write(format(valores[campo], formato))
+
+_TEMPLATE_DASHBOARD = _compilar_template(HTML_DASHBOARD)
+# Campos exigidos pelo template do dashboard (calculados uma vez na importação)
+_CAMPOS_DASHBOARD = frozenset(campo for _, campo, _ in _TEMPLATE_DASHBOARD if campo is not None)
+_TEMPLATE_PREVISAO_PERIODO = _compilar_template(HTML_PREVISAO_PERIODO)
+_TEMPLATE_PREVISAO_CARD = _compilar_template(HTML_PREVISAO_CARD)
+_TEMPLATE_METRICAS_CARD = _compilar_template(HTML_METRICAS_CARD)
+_TEMPLATE_HISTORICO_LINHA = _compilar_template(HTML_HISTORICO_LINHA)
+
+def _ols_r2(x, y):
+    """Regressão linear simples em forma fechada: retorna (coeficiente, intercepto, R²)"""
+    media_x = x.mean()
+    media_y = y.mean()
+    dx = x - media_x
+    dy = y - media_y
+    coeficiente = (dx * dy).sum() / (dx * dx).sum()
+    intercepto = media_y - coeficiente * media_x
+    residuos = y - (coeficiente * x + intercepto)
+    ss_res = (residuos * residuos).sum()
+    ss_tot = (dy * dy).sum()
+    # Mesma convenção do sklearn.metrics.r2_score para y constante
+    if ss_tot == 0.0:
+        r2 = 1.0 if ss_res == 0.0 else 0.0
+    else:
+        r2 = 1.0 - ss_res / ss_tot
+    return coeficiente, intercepto, r2
+
+if njit is not None:
+    _ols_r2 = njit(cache=True)(_ols_r2)
+
+def _pearson(a, b):
+    """Coeficiente de correlação de Pearson entre dois vetores (forma fechada)"""
+    da = a - a.mean()
+    db = b - b.mean()
+    return (da * db).sum() / np.sqrt((da * da).sum() * (db * db).sum())
+
+if njit is not None:
+    _pearson = njit(cache=True, error_model='numpy')(_pearson)
+
+def _ols_r2_lote(x, Y):
+    """Versão em lote de _ols_r2: uma regressão por coluna de Y, ignorando valores NaN"""
+    validos = ~np.isnan(Y)
+    X = np.broadcast_to(x[:, None], Y.shape)
+    n = validos.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media_x = np.where(validos, X, 0.0).sum(axis=0) / n
+        media_y = np.where(validos, Y, 0.0).sum(axis=0) / n
+        dx = np.where(validos, X - media_x, 0.0)
+        dy = np.where(validos, Y - media_y, 0.0)
+        coeficientes = (dx * dy).sum(axis=0) / (dx * dx).sum(axis=0)
+        interceptos = media_y - coeficientes * media_x
+        residuos = np.where(validos, Y - (coeficientes * X + interceptos), 0.0)
+        ss_res = (residuos * residuos).sum(axis=0)
+        ss_tot = (dy * dy).sum(axis=0)
+        r2s = np.where(ss_tot == 0.0, np.where(ss_res == 0.0, 1.0, 0.0), 1.0 - ss_res / ss_tot)
+    return coeficientes, interceptos, r2s
+
+@dataclass(slots=True)
+class Gargalo:
+    """Gargalo detectado em um colaborador ou na distribuição de carga do grupo"""
+    tipo: str
+    valor: float
+    colaborador: Optional[str] = None
+    media_grupo: Optional[float] = None
+    diferenca_percentual: Optional[float] = None
+    descricao: Optional[str] = None
+
+class AnalisadorAvancado:
+    def __init__(self):
+        """Inicializa o analisador avançado"""
+        try:
+            # Inicializar estruturas de dados
+            self.metricas_julio = {}
+            self.metricas_leandro = {}
+            # Visão colunar (colaborador x métrica) usada pelas análises vetorizadas
+            self.df_julio = _tabela_metricas({})
+            self.df_leandro = _tabela_metricas({})
+            self.gargalos = {}
+            self.ultima_analise = None
+            self.historico_analises = []
+            self.resultados_preditivos = {}
+            self._corr_cache = {}
+            # Fragmentos HTML do dashboard já gerados para a análise atual
+            self._fragmentos_html = {}
+            # (mtime, tamanho) de cada arquivo já analisado
+            self._assinaturas = {}
+            # Buffer circular histórico[análise, colaborador] das últimas análises
+            self._hist_ef = np.full((MAX_HISTORICO, len(_INDICE_COLABORADOR)), np.nan, dtype=np.float32)
+            self._hist_ptr = 0
+            self._carregar_historico()
+            # Pool reaproveitado entre análises (criado só na primeira análise, liberado em close())
+            self._pool = None
+            
+        except Exception as e:
+            raise RuntimeError(f"Erro ao inicializar analisador: {str(e)}")
+
+    def analisar_arquivo(self, caminho_arquivo=None):
+        """Realiza a análise detalhada do arquivo Excel"""
+        if not caminho_arquivo:
+            caminho_arquivo = 'dados_analise.xlsx'
+
+        logger.info("Iniciando análise detalhada do arquivo...")
+        
+        try:
+            # Pular a análise se o arquivo não mudou desde a última vez
+            info = os.stat(caminho_arquivo)
+            caminho_absoluto = os.path.abspath(caminho_arquivo)
+            assinatura = (info.st_mtime_ns, info.st_size)
+            if self._assinaturas.get(caminho_absoluto) == assinatura:
+                logger.info(f"Sem alterações em {caminho_arquivo} desde a última análise")
+                return
+            
+            # Registrar data e hora da análise
+            self.ultima_analise = datetime.now()
+            self._corr_cache = {}
+            self._fragmentos_html = {}
+            
+            # Ler todas as abas do arquivo Excel
+            excel_file = pd.ExcelFile(caminho_arquivo, engine='calamine')
+            
+            # Ler todas as abas de colaboradores (cache Parquet ou Excel)
+            abas = self._ler_abas(
+                caminho_arquivo, excel_file,
+                [aba for aba in excel_file.sheet_names if aba in _COLABORADORES]
+            )
+            
+            # Selecionar as abas a processar
+            itens = []
+            for nome_aba in excel_file.sheet_names:
+                if nome_aba not in _COLABORADORES:
+                    logger.info(f"Pulando aba {nome_aba} - não é um colaborador")
+                    continue
+                    
+                logger.info(f"\nAnalisando dados de: {nome_aba}")
+                
+                df = abas[nome_aba]
+                
+                # Verificar se temos pelo menos a coluna DATA
+                if 'DATA' not in df.columns:
+                    logger.error(f"Erro: Coluna DATA não encontrada na aba {nome_aba}")
+                    continue
+                
+                itens.append((nome_aba, df))
+            
+            # Processar os dados dos colaboradores em paralelo (abas independentes)
+            if itens:
+                futuros = [(nome_aba, self._obter_pool().submit(AnalisadorAvancado.processar_dados_colaborador, nome_aba, df)) for nome_aba, df in itens]
+                
+                for nome_aba, futuro in futuros:
+                    try:
+                        metricas = futuro.result()
+                        
+                        if metricas:
+                            # Adicionar às métricas do grupo apropriado
+                            if nome_aba in _GRUPO_JULIO:
+                                self.metricas_julio[nome_aba] = metricas
+                            else:
+                                self.metricas_leandro[nome_aba] = metricas
+                    
+                    except Exception as e:
+                        logger.error(f"Erro ao processar aba {nome_aba}: {str(e)}")
+                        continue
+            
+            self.df_julio = _tabela_metricas(self.metricas_julio)
+            self.df_leandro = _tabela_metricas(self.metricas_leandro)
+
+            # Salvar histórico da análise se temos dados
+            if self.metricas_julio or self.metricas_leandro:
+                self._registrar_historico()
+
+                # Realizar análises comparativas
+                self.analisar_correlacoes()
+                self.detectar_gargalos()
+                self.analisar_tendencias()
+                self.realizar_analise_preditiva()
+                
+                # Gerar o dashboard
+                self.gerar_dashboard_html()
+            else:
+                logger.info("\nNenhum dado válido encontrado para análise")
+            
+            self._assinaturas[caminho_absoluto] = assinatura
+            
+        except Exception as e:
+            logger.error(f"Erro ao analisar arquivo: {str(e)}")
+            raise
+
+    def _obter_pool(self):
+        """Pool de processos das abas, criado no primeiro uso"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+                initializer=_iniciar_worker
+            )
+        return self._pool
+
+    def close(self):
+        """Encerra o pool de processos usado no processamento das abas (se chegou a ser criado)"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _registrar_historico(self):
+        """Acrescenta a análise atual ao log Parquet e mantém em memória só o resumo"""
+        linhas = [
+            {
+                'data': self.ultima_analise,
+                'grupo': grupo_nome,
+                'colaborador': colaborador,
+                'eficiencia': float(dados.get('taxa_eficiencia', 0)),
+                'total': int(dados.get('total_registros', 0))
+            }
+            for grupo_nome, metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]
+            for colaborador, dados in metricas.items()
+            if dados
+        ]
+        if not linhas:
+            return
+        
+        os.makedirs(HISTORICO_DIR, exist_ok=True)
+        df = pd.DataFrame(linhas)
+        df.to_parquet(
+            os.path.join(HISTORICO_DIR, f"{self.ultima_analise:%Y%m%d_%H%M%S_%f}.parquet"),
+            engine='pyarrow', index=False
+        )
+        
+        # Manter no disco só as últimas 10 análises (o nome do arquivo ordena pela data)
+        for antigo in _arquivos_historico()[:-MAX_HISTORICO]:
+            try:
+                os.remove(antigo)
+            except OSError as e:
+                logger.warning(f"Aviso: histórico antigo {antigo} não pôde ser removido: {str(e)}")
+        
+        # Registrar a eficiência de cada colaborador na próxima posição do buffer circular
+        linha = np.full(len(_INDICE_COLABORADOR), np.nan, dtype=np.float32)
+        linha[[_INDICE_COLABORADOR[c] for c in df['colaborador']]] = df['eficiencia'].to_numpy()
+        self._hist_ef[self._hist_ptr % MAX_HISTORICO] = linha
+        self._hist_ptr += 1
+        
+        self.historico_analises.append({
+            'data': self.ultima_analise,
+            'colaboradores': len(df),
+            'eficiencia_media': df['eficiencia'].mean()
+        })
+        
+        # Manter apenas as últimas 10 análises
+        if len(self.historico_analises) > MAX_HISTORICO:
+            self.historico_analises = self.historico_analises[-MAX_HISTORICO:]
+
+    def _carregar_historico(self):
+        """Preenche o buffer circular com as últimas análises gravadas no log Parquet"""
+        # Ler só os arquivos das últimas 10 análises, não o diretório inteiro
+        arquivos = _arquivos_historico()[-MAX_HISTORICO:]
+        if not arquivos:
+            return
+        
+        try:
+            df = pd.concat(
+                [pd.read_parquet(arquivo, engine='pyarrow', columns=['data', 'colaborador', 'eficiencia']) for arquivo in arquivos],
+                ignore_index=True
+            )
+            tabela = df.pivot(index='data', columns='colaborador', values='eficiencia').sort_index()
+        except Exception as e:
+            logger.warning(f"Aviso: histórico de análises não pôde ser carregado: {str(e)}")
+            return
+        
+        # Manter apenas as últimas 10 análises
+        valores = tabela.iloc[-MAX_HISTORICO:].reindex(columns=list(_INDICE_COLABORADOR)).to_numpy(dtype=np.float32)
+        self._hist_ef[:len(valores)] = valores
+        self._hist_ptr = len(valores)
+
+    def _historico_eficiencia(self):
+        """Linhas preenchidas do buffer circular, da análise mais antiga para a mais recente"""
+        n = min(self._hist_ptr, MAX_HISTORICO)
+        if n == 0:
+            return self._hist_ef[:0]
+        return np.roll(self._hist_ef, -(self._hist_ptr % MAX_HISTORICO), axis=0)[-n:]
+
+    def _ler_abas(self, caminho_arquivo, excel_file, nomes_abas):
+        """Lê as abas do Excel, reaproveitando o cache Parquet enquanto o arquivo não mudar"""
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        mtime = os.path.getmtime(caminho_arquivo)
+        caminhos_cache = {}
+        for aba in nomes_abas:
+            chave = hashlib.sha1(f"{os.path.abspath(caminho_arquivo)}:{mtime}:{aba}".encode()).hexdigest()
+            caminhos_cache[aba] = os.path.join(CACHE_DIR, f"{chave}.parquet")
+        
+        abas = {
+            aba: pd.read_parquet(caminho, engine='pyarrow', dtype_backend='pyarrow')
+            for aba, caminho in caminhos_cache.items()
+            if os.path.exists(caminho)
+        }
+        
+        # Ler do Excel (de uma vez) apenas as abas sem cache
+        faltantes = [aba for aba in nomes_abas if aba not in abas]
+        if faltantes:
+            lidas = pd.read_excel(excel_file, sheet_name=faltantes)
+            for aba, df in lidas.items():
+                try:
+                    df.to_parquet(caminhos_cache[aba], engine='pyarrow', compression='zstd')
+                except Exception as e:
+                    # Colunas com tipos mistos não são serializáveis; a aba só fica sem cache
+                    logger.warning(f"Aviso: aba {aba} não foi salva em cache: {str(e)}")
+            abas.update(lidas)
+        
+        return abas
+
+    def _correlacao_grupo(self, grupo, tabela, com_p_valor=False):
+        """Correlação volume x eficiência do grupo, calculada uma única vez por análise"""
+        chave = grupo.upper()
+        n, coeficiente, p_valor = self._corr_cache.get(chave, (None, None, None))
+        if n is None or (com_p_valor and coeficiente is not None and p_valor is None):
+            validos = tabela[tabela['total_registros'] > 0]
+            # Entradas em float32; a correlação é calculada em float64
+            volumes = validos['total_registros'].to_numpy(dtype=np.float32).astype(np.float64)
+            eficiencias = validos['taxa_eficiencia'].to_numpy(dtype=np.float32).astype(np.float64)
+            coeficiente = p_valor = None
+            if volumes.size >= 2:  # Precisamos de pelo menos 2 pontos para correlação
+                if com_p_valor:
+                    from scipy import stats  # importado sob demanda (carregamento pesado)
+                    coeficiente, p_valor = stats.pearsonr(volumes, eficiencias)
+                else:
+                    coeficiente = _pearson(volumes, eficiencias)
+            self._corr_cache[chave] = (volumes.size, coeficiente, p_valor)
+        return self._corr_cache[chave]
+
+    def calcular_correlacao_volume_eficiencia(self):
+        """Calcula a correlação entre volume de casos e eficiência para cada grupo"""
+        logger.info("\n=== Análise de Correlação Volume vs Eficiência ===")
+        
+        resultados = {}
+        for grupo, tabela in [("JULIO", self.df_julio), ("LEANDRO", self.df_leandro)]:
+            try:
+                _, coeficiente, p_valor = self._correlacao_grupo(grupo, tabela, com_p_valor=True)
+            except Exception as e:
+                logger.error(f"Erro ao calcular correlação para grupo {grupo}: {str(e)}")
+                continue
+            
+            if coeficiente is None:
+                logger.info(f"\nGrupo {grupo}: Dados insuficientes para análise de correlação")
+                continue
+                
+            resultados[grupo] = {
+                'coeficiente': coeficiente,
+                'p_valor': p_valor
+            }
+            
+            logger.info(f"\nGrupo {grupo}:")
+            logger.info(f"Coeficiente de correlação: {coeficiente:.3f}")
+            logger.info(f"P-valor: {p_valor:.3f}")
+            
+            if p_valor < 0.05:
+                if coeficiente > 0:
+                    logger.info("=> Correlação positiva significativa: Maior volume está associado a maior eficiência")
+                else:
+                    logger.info("=> Correlação negativa significativa: Maior volume está associado a menor eficiência")
+            else:
+                logger.info("=> Não há correlação significativa entre volume e eficiência")
+        
+        return resultados
+    
+    def analisar_correlacoes(self):
+        """Analisa correlações entre diferentes métricas"""
+        try:
+            logger.info("\n=== Análise de Correlações ===")
+            
+            # Analisar correlações para cada grupo
+            for grupo_nome, tabela in [("Julio", self.df_julio), ("Leandro", self.df_leandro)]:
+                if tabela.empty:
+                    continue
+                    
+                logger.info(f"\nGrupo {grupo_nome}:")
+                
+                n_colaboradores, corr, _ = self._correlacao_grupo(grupo_nome, tabela)
+                
+                if not n_colaboradores:
+                    logger.info("Sem dados suficientes para análise")
+                    continue
+                
+                # Calcular correlação entre volume e eficiência
+                if corr is not None:
+                    logger.info(f"Correlação volume vs eficiência: {corr:.2f}")
+                    
+                    # Identificar padrões
+                    if abs(corr) > 0.7:
+                        if corr > 0:
+                            logger.info("Forte correlação positiva: maior volume tende a ter maior eficiência")
+                        else:
+                            logger.info("Forte correlação negativa: maior volume tende a ter menor eficiência")
+                    elif abs(corr) > 0.3:
+                        logger.info("Correlação moderada")
+                    else:
+                        logger.info("Correlação fraca: volume e eficiência parecem ser independentes")
+                else:
+                    logger.info("Dados insuficientes para calcular correlações")
+        
+        except Exception as e:
+            logger.error(f"Erro ao analisar correlações: {str(e)}")
+            return None
+
+    def detectar_gargalos(self):
+        """Detecta gargalos no processo baseado em diversos indicadores"""
+        try:
+            logger.info("\n=== Detecção de Gargalos ===")
+            
+            self.gargalos = {
+                "Julio": [],
+                "Leandro": []
+            }
+            
+            # Analisar cada grupo
+            for grupo_nome, tabela in [("Julio", self.df_julio), ("Leandro", self.df_leandro)]:
+                if tabela.empty:
+                    continue
+                    
+                logger.info(f"\nGrupo {grupo_nome}:")
+                
+                # Calcular métricas médias do grupo
+                # float32 basta para estes agregados (N < 100); médias acumuladas em float64
+                total_registros = tabela['total_registros'].to_numpy(dtype=np.float32)
+                taxa_eficiencia = tabela['taxa_eficiencia'].to_numpy(dtype=np.float32)
+                    
+                media_registros = total_registros.mean(dtype=np.float64)
+                media_eficiencia = taxa_eficiencia.mean(dtype=np.float64)
+                
+                logger.info(f"Média de registros: {media_registros:.2f}")
+                logger.info(f"Média de eficiência: {media_eficiencia:.2f}")
+                
+                # Limiares e inversos das médias calculados uma única vez por grupo
+                limite_eficiencia = media_eficiencia * 0.7
+                limite_volume = media_registros * 1.5
+                inv_media_eficiencia = 1.0 / media_eficiencia
+                inv_media_registros = 1.0 / media_registros
+                
+                # Identificar colaboradores com métricas significativamente abaixo da média
+                mask_eficiencia = taxa_eficiencia < limite_eficiencia
+                mask_volume = total_registros > limite_volume
+                diff_eficiencia = (taxa_eficiencia * inv_media_eficiencia - 1) * 100
+                diff_volume = (total_registros * inv_media_registros - 1) * 100
+                
+                registrar_gargalo = self.gargalos[grupo_nome].append
+                
+                for i in np.flatnonzero(mask_eficiencia | mask_volume):
+                    colaborador = tabela.index[i]
+                    eficiencia = float(tabela['taxa_eficiencia'].iat[i])
+                    volume = int(tabela['total_registros'].iat[i])
+                        
+                    # Verificar eficiência
+                    if mask_eficiencia[i]:
+                        gargalo = Gargalo("eficiência", eficiencia, colaborador, media_eficiencia, diff_eficiencia[i])
+                        registrar_gargalo(gargalo)
+                        logger.warning(f"⚠️ Gargalo de eficiência detectado: {colaborador} ({eficiencia:.2f} vs média {media_eficiencia:.2f})")
+                    
+                    # Verificar volume desproporcional
+                    if mask_volume[i]:
+                        gargalo = Gargalo("volume", volume, colaborador, media_registros, diff_volume[i])
+                        registrar_gargalo(gargalo)
+                        logger.warning(f"⚠️ Volume desproporcional detectado: {colaborador} ({volume} vs média {media_registros:.2f})")
+                
+                # Verificar distribuição de carga
+                if total_registros.size > 1:
+                    cv = total_registros.std(dtype=np.float64) / media_registros  # Coeficiente de variação
+                    if cv > 0.5:  # Alta variabilidade
+                        gargalo = Gargalo("distribuição", cv, descricao="Distribuição desigual de carga entre colaboradores")
+                        registrar_gargalo(gargalo)
+                        logger.warning(f"⚠️ Distribuição desigual de carga detectada (CV={cv:.2f})")
+            
+            return self.gargalos
             
-            <!-- Aba do Grupo Leandro -->
-            <div class="tab-pane fade" id="leandro" role="tabpanel" aria-labelledby="leandro-tab">
-                {metricas_leandro_html}
-            </div>
+        except Exception as e:
+            logger.error(f"Erro ao detectar gargalos: {str(e)}")
+            return None
+
+    def prever_tendencias(self):
+        """Analisa tendências e faz previsões simples"""
+        logger.info("\n=== Análise de Tendências e Previsões ===")
+        
+        for grupo, metricas in [("JULIO", self.metricas_julio), ("LEANDRO", self.metricas_leandro)]:
+            logger.info(f"\nGrupo {grupo}:")
             
-            <!-- Aba de Previsões -->
-            <div class="tab-pane fade" id="previsoes" role="tabpanel" aria-labelledby="previsoes-tab">
-                <div class="row">
-                    <div class="col-md-12 mb-4">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>Análise Preditiva</h5>
-                            </div>
-                            <div class="card-body">
-                                <p>Esta seção apresenta previsões baseadas em modelos estatísticos aplicados aos dados históricos. 
-                                As previsões consideram a tendência atual e padrões identificados nas análises anteriores.</p>
-                                
-                                <div class="alert alert-info">
-                                    <strong>Nota:</strong> A confiabilidade das previsões está diretamente relacionada à quantidade 
-                                    de dados históricos disponíveis e à consistência dos padrões observados.
-                                </div>
-                            </div>
-                        </div>
-                    </div>
+            # Análise de tendências por colaborador
+            for colab, dados in metricas.items():
+                if 'tendencia' in dados:
+                    tendencia = dados['tendencia']
+                    logger.info(f"\nColaborador: {colab}")
                     
-                    <div class="col-md-6">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>Previsões - Grupo Julio</h5>
-                            </div>
-                            <div class="card-body">
-                                {previsoes_julio_html}
-                            </div>
-                        </div>
-                    </div>
+                    # Interpretar coeficiente angular
+                    slope = tendencia.get('direcao', '')
+                    r2 = tendencia.get('r2', 0)
                     
-                    <div class="col-md-6">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>Previsões - Grupo Leandro</h5>
-                            </div>
-                            <div class="card-body">
-                                {previsoes_leandro_html}
-                            </div>
-                        </div>
-                    </div>
+                    if slope == "estável":
+                        tendencia_str = "estável"
+                    elif slope == "crescente":
+                        tendencia_str = "crescente"
+                    else:
+                        tendencia_str = "decrescente"
                     
-                    <div class="col-md-12 mt-4">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>Visualização de Tendências</h5>
-                            </div>
-                            <div class="card-body">
-                                <div id="grafico-previsoes"></div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
+                    logger.info(f"Tendência: {tendencia_str}")
+                    logger.info(f"R² = {r2:.3f}")
+                    
+                    # Fazer previsão para próxima semana
+                    if r2 > 0.3:  # Só fazer previsão se o modelo tiver um ajuste razoável
+                        ultima_eficiencia = dados['taxa_eficiencia']
+                        previsao_proxima_semana = ultima_eficiencia + (slope * 7)  # 7 dias
+                        logger.info(f"Previsão de eficiência para próxima semana: {previsao_proxima_semana*100:.1f}%")
+                        
+                        if previsao_proxima_semana < ultima_eficiencia * 0.8:
+                            logger.info(" Alerta: Possível queda significativa na eficiência")
+                        elif previsao_proxima_semana > ultima_eficiencia * 1.2:
+                            logger.info(" Expectativa de melhoria significativa na eficiência")
+
+    def analisar_tendencias(self):
+        """Analisa tendências nos dados"""
+        try:
+            logger.info("\n=== Análise de Tendências ===")
             
-            <!-- Aba de Histórico -->
-            <div class="tab-pane fade" id="historico" role="tabpanel" aria-labelledby="historico-tab">
-                <div class="card">
-                    <div class="card-header">
-                        <h5>Histórico de Análises</h5>
-                    </div>
-                    <div class="card-body">
-                        {historico_html}
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-    <script>
-        // Scripts para gráficos Plotly
-        {scripts_plotly}
+            # Analisar tendências para cada grupo
+            for grupo_nome, metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
+                if not metricas:
+                    continue
+                    
+                logger.info(f"\nGrupo {grupo_nome}:")
+                
+                # Analisar tendências por colaborador
+                for colaborador, dados in metricas.items():
+                    if not dados or 'tendencia' not in dados:
+                        continue
+                        
+                    tendencia = dados['tendencia']
+                    logger.info(f"\n{colaborador}:")
+                    logger.info(f"Direção: {tendencia['direcao']}")
+                    logger.info(f"R²: {tendencia['r2']:.3f}")
+                    
+                    # Interpretar a tendência
+                    if tendencia['r2'] > 0.7:
+                        logger.info("Tendência forte e consistente")
+                    elif tendencia['r2'] > 0.3:
+                        logger.info("Tendência moderada")
+                    else:
+                        logger.info("Tendência fraca ou dados muito variáveis")
         
-        // Inicializar tooltips
-        var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'))
-        var tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {{
-            return new bootstrap.Tooltip(tooltipTriggerEl)
-        }})
-    </script>
-</body>
-</html>
-"""
+        except Exception as e:
+            logger.error(f"Erro ao analisar tendências: {str(e)}")
+            return None
+
+    def realizar_analise_preditiva(self):
+        """
+        Realiza análise preditiva avançada para prever métricas futuras com base em dados históricos.
+        Utiliza modelos de regressão linear e análise de séries temporais para gerar previsões.
+        """
+        logger.info("\n=== Análise Preditiva Avançada ===")
+        
+        # Verificar se temos dados históricos suficientes
+        historico_ef = self._historico_eficiencia()
+        if len(historico_ef) < 2:
+            logger.info("Dados históricos insuficientes para análise preditiva. Necessário pelo menos 2 análises.")
+            return None
+        
+        resultados_preditivos = {
+            "Julio": {},
+            "Leandro": {}
+        }
+        
+        try:
+            # Para cada grupo, realizar previsões
+            for grupo_nome, grupo_metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
+                if not grupo_metricas:
+                    continue
+                
+                logger.info(f"\nPrevisões para grupo {grupo_nome}:")
+                
+                # Montar matriz histórico[análise, colaborador] (NaN quando ausente)
+                colaboradores = list(grupo_metricas.keys())
+                historico = historico_ef[:, [_INDICE_COLABORADOR[c] for c in colaboradores]]
+                
+                # Ajustar as regressões de todos os colaboradores de uma vez (índice como proxy para tempo)
+                coeficientes, interceptos, r2s = _ols_r2_lote(
+                    np.arange(len(historico), dtype=np.float64), historico.astype(np.float64)
+                )
+                
+                # Para cada colaborador, usar o modelo preditivo
+                for j, colaborador in enumerate(colaboradores):
+                    dados_historicos = historico[~np.isnan(historico[:, j]), j].tolist()
+                    
+                    # Se temos pelo menos 3 pontos de dados, podemos fazer previsão
+                    if len(dados_historicos) >= 3:
+                        coeficiente, intercepto, r2 = coeficientes[j], interceptos[j], r2s[j]
+                        
+                        # Fazer previsão para próximos 3 períodos
+                        proximos_periodos = np.arange(len(dados_historicos), len(dados_historicos) + 3, dtype=np.float64)
+                        previsoes = intercepto + coeficiente * proximos_periodos
+                        
+                        # Armazenar resultados
+                        resultados_preditivos[grupo_nome][colaborador] = {
+                            "historico": dados_historicos,
+                            "previsoes": previsoes.tolist(),
+                            "r2": r2,
+                            "tendencia": "crescente" if coeficiente > 0 else "decrescente",
+                            "coeficiente": float(coeficiente),
+                            "intercepto": float(intercepto)
+                        }
+                        
+                        # Exibir resultados
+                        logger.info(f"\n{colaborador}:")
+                        logger.info(f"  Histórico de eficiência: {[f'{x:.2f}' for x in dados_historicos]}")
+                        logger.info(f"  Previsão próximos 3 períodos: {[f'{x:.2f}' for x in previsoes]}")
+                        logger.info(f"  Confiança do modelo (R²): {r2:.2f}")
+                        logger.info(f"  Tendência: {resultados_preditivos[grupo_nome][colaborador]['tendencia']}")
+                        
+                        # Alertas baseados na previsão
+                        ultima_eficiencia = dados_historicos[-1]
+                        proxima_previsao = previsoes[0]
+                        
+                        if proxima_previsao < ultima_eficiencia * 0.8 and r2 > 0.5:
+                            logger.info("  ⚠️ ALERTA: Possível queda significativa na eficiência")
+                        elif proxima_previsao > ultima_eficiencia * 1.2 and r2 > 0.5:
+                            logger.info("  ✅ Expectativa de melhoria significativa na eficiência")
+                    else:
+                        logger.info(f"\n{colaborador}: Dados históricos insuficientes para previsão")
+            
+            # Salvar resultados para uso no dashboard
+            self.resultados_preditivos = resultados_preditivos
+            return resultados_preditivos
+            
+        except Exception as e:
+            logger.exception(f"Erro ao realizar análise preditiva: {str(e)}")
+            return None
+
+    def gerar_dashboard_html(self):
+        """Gera um dashboard HTML com os resultados da análise"""
         
         try:
+            # Atributos usados várias vezes abaixo, lidos uma única vez
+            metricas_julio = self.metricas_julio
+            metricas_leandro = self.metricas_leandro
+            ultima_analise = self.ultima_analise
+            
             # Preparar dados para o template
-            data_atualizacao = self.ultima_analise.strftime("%d/%m/%Y %H:%M") if self.ultima_analise else "N/A"
+            data_atualizacao = ultima_analise.strftime("%d/%m/%Y %H:%M") if ultima_analise else "N/A"
             
             # Calcular métricas gerais
-            total_colaboradores = len(self.metricas_julio) + len(self.metricas_leandro)
+            total_colaboradores = len(metricas_julio) + len(metricas_leandro)
             
-            total_registros = 0
-            soma_eficiencia = 0
-            count_eficiencia = 0
+            # Agregados dos dois grupos calculados sobre as colunas das tabelas (sem laço por colaborador)
+            tabelas = (self.df_julio, self.df_leandro)
+            total_registros = int(sum(tabela['total_registros'].sum() for tabela in tabelas))
+            eficiencias = np.concatenate([tabela['taxa_eficiencia'].to_numpy() for tabela in tabelas])
+            eficiencia_media = eficiencias.mean() if eficiencias.size > 0 else 0
             
-            for metricas in [self.metricas_julio, self.metricas_leandro]:
-                for dados in metricas.values():
-                    if dados:
-                        total_registros += dados.get('total_registros', 0)
-                        if 'taxa_eficiencia' in dados:
-                            soma_eficiencia += dados['taxa_eficiencia']
-                            count_eficiencia += 1
-            
-            eficiencia_media = soma_eficiencia / count_eficiencia if count_eficiencia > 0 else 0
+            direcoes = np.concatenate([tabela['tendencia_direcao'].to_numpy(dtype=object) for tabela in tabelas])
+            tendencias_crescentes = int((direcoes == 'crescente').sum())
+            tendencias_decrescentes = int((direcoes == 'decrescente').sum())
             
             # Determinar tendência geral
             tendencia_geral = "Estável"
             tendencia_class = "trend-stable"
             
-            tendencias_crescentes = 0
-            tendencias_decrescentes = 0
-            
-            for metricas in [self.metricas_julio, self.metricas_leandro]:
-                for dados in metricas.values():
-                    if dados and 'tendencia' in dados:
-                        if dados['tendencia']['direcao'] == 'crescente':
-                            tendencias_crescentes += 1
-                        elif dados['tendencia']['direcao'] == 'decrescente':
-                            tendencias_decrescentes += 1
-            
             if tendencias_crescentes > tendencias_decrescentes * 1.5:
                 tendencia_geral = "Crescente ↑"
                 tendencia_class = "trend-up"
@@ -724,55 +1043,36 @@ class AnalisadorAvancado:
             # Gerar HTML para alertas e gargalos
             alertas_html = "<div class='alert alert-success'>Nenhum alerta crítico identificado.</div>"
             
-            gargalos_encontrados = []
-            for grupo, gargalos in self.gargalos.items():
-                for gargalo in gargalos:
-                    if 'colaborador' in gargalo:
-                        if gargalo['tipo'] == 'eficiência':
-                            gargalos_encontrados.append(
-                                f"<div class='alert alert-warning'>"
-                                f"<strong>{gargalo['colaborador']}</strong> - Eficiência abaixo da média do grupo "
-                                f"({gargalo['valor']:.2f}% vs {gargalo['media_grupo']:.2f}%)"
-                                f"</div>"
-                            )
-                        elif gargalo['tipo'] == 'volume':
-                            gargalos_encontrados.append(
-                                f"<div class='alert alert-warning'>"
-                                f"<strong>{gargalo['colaborador']}</strong> - Volume de trabalho desproporcional "
-                                f"({gargalo['valor']} registros vs média de {gargalo['media_grupo']:.0f})"
-                                f"</div>"
-                            )
-                    elif gargalo.get('tipo') == 'distribuição':
-                        gargalos_encontrados.append(
-                            f"<div class='alert alert-warning'>"
-                            f"<strong>Grupo {grupo}</strong> - {gargalo['descricao']} "
-                            f"(CV = {gargalo['valor']:.2f})"
-                            f"</div>"
-                        )
+            gargalos_encontrados = [
+                _HTML_GARGALO[gargalo.tipo].format(g=gargalo, grupo=grupo)
+                for grupo, gargalos in self.gargalos.items()
+                for gargalo in gargalos
+                if gargalo.tipo in _HTML_GARGALO
+            ]
             
             if gargalos_encontrados:
                 alertas_html = "\n".join(gargalos_encontrados)
             
             # Gerar HTML para métricas de cada grupo
-            metricas_julio_html = self.gerar_html_metricas(self.metricas_julio)
-            metricas_leandro_html = self.gerar_html_metricas(self.metricas_leandro)
+            metricas_julio_html = self._fragmento_html('metricas_julio', self.gerar_html_metricas, metricas_julio)
+            metricas_leandro_html = self._fragmento_html('metricas_leandro', self.gerar_html_metricas, metricas_leandro)
             
             # Gerar HTML para histórico
-            historico_html = self.gerar_html_historico()
+            historico_html = self._fragmento_html('historico', self.gerar_html_historico)
             
             # Gerar HTML para previsões
-            previsoes_julio_html = self.gerar_html_previsoes("Julio")
-            previsoes_leandro_html = self.gerar_html_previsoes("Leandro")
+            previsoes_julio_html = self._fragmento_html('previsoes_julio', self.gerar_html_previsoes, "Julio")
+            previsoes_leandro_html = self._fragmento_html('previsoes_leandro', self.gerar_html_previsoes, "Leandro")
             
             # Gerar scripts para gráficos Plotly
-            scripts_plotly = self.gerar_scripts_plotly()
+            scripts_plotly = self._fragmento_html('scripts_plotly', self.gerar_scripts_plotly)
             
-            # Substituir placeholders no template
-            html_final = html_template.format(
+            # Valores dos placeholders do template
+            valores = dict(
                 data_atualizacao=data_atualizacao,
                 total_colaboradores=total_colaboradores,
                 total_registros=total_registros,
-                eficiencia_media=eficiencia_media * 100,  # Converter para percentual
+                eficiencia_media=eficiencia_media,  # taxa_eficiencia já está em percentual
                 tendencia_geral=tendencia_geral,
                 tendencia_class=tendencia_class,
                 alertas_html=alertas_html,
@@ -784,25 +1084,34 @@ class AnalisadorAvancado:
                 scripts_plotly=scripts_plotly
             )
             
-            # Salvar o HTML em um arquivo
-            with open('dashboard_atividades.html', 'w', encoding='utf-8') as f:
-                f.write(html_final)
+            # Validar os campos antes de abrir o arquivo, para não deixar uma página pela metade
+            faltantes = _CAMPOS_DASHBOARD - valores.keys()
+            if faltantes:
+                raise KeyError(f"Campos ausentes no template do dashboard: {', '.join(sorted(faltantes))}")
             
-            print(f"\nDashboard gerado com sucesso: dashboard_atividades.html")
+            # Escrever o HTML direto no arquivo, trecho a trecho (sem montar a página inteira em memória)
+            with open('dashboard_atividades.html', 'w', encoding='utf-8', buffering=1 << 16) as f:
+                _escrever_template(f, _TEMPLATE_DASHBOARD, valores)
+            
+            logger.info("\nDashboard gerado com sucesso: dashboard_atividades.html")
             
         except Exception as e:
-            print(f"Erro ao gerar dashboard HTML: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Erro ao gerar dashboard HTML: {str(e)}")
+
+    def _fragmento_html(self, chave, gerar, *args):
+        """Gera um fragmento do dashboard uma única vez por análise (cache limpo em analisar_arquivo)"""
+        if chave not in self._fragmentos_html:
+            self._fragmentos_html[chave] = gerar(*args)
+        return self._fragmentos_html[chave]
 
     def gerar_html_previsoes(self, grupo):
         """Gera o HTML para exibir as previsões de um grupo"""
         if grupo not in self.resultados_preditivos or not self.resultados_preditivos[grupo]:
             return "<p>Não há dados de previsão disponíveis para este grupo.</p>"
         
-        html_partes = []
+        buffer = io.StringIO()
         
-        for colaborador, dados in self.resultados_preditivos[grupo].items():
+        for i, (colaborador, dados) in enumerate(self.resultados_preditivos[grupo].items()):
             # Determinar classe de confiança
             confianca_class = "confidence-low"
             confianca_texto = "Baixa"
@@ -815,106 +1124,176 @@ class AnalisadorAvancado:
                 confianca_texto = "Média"
             
             # Formatar previsões
-            previsoes = dados['previsoes']
-            html_previsoes = ""
+            buffer_previsoes = io.StringIO()
+            for periodo, prev in enumerate(dados['previsoes'], start=1):
+                _escrever_template(buffer_previsoes, _TEMPLATE_PREVISAO_PERIODO, {'periodo': periodo, 'prev': prev})
             
-            for i, prev in enumerate(previsoes):
-                periodo = i + 1
-                html_previsoes += f"""
-                <div class="col-md-4">
-                    <div class="prediction-card p-2 mb-2">
-                        <div class="prediction-date">Período {periodo}</div>
-                        <div class="prediction-value">{prev:.2f}%</div>
-                    </div>
-                </div>
-                """
+            # Classe e rótulo da tendência calculados uma vez por colaborador
+            tendencia = dados['tendencia']
+            classe_tendencia = 'trend-up' if tendencia == 'crescente' else 'trend-down'
             
-            # Montar card do colaborador
-            html_partes.append(f"""
-            <div class="card mb-3">
-                <div class="card-header">
-                    <h6>{colaborador}</h6>
-                </div>
-                <div class="card-body">
-                    <div class="row mb-2">
-                        <div class="col-md-6">
-                            <span class="metric-label">Tendência:</span>
-                            <span class="{'trend-up' if dados['tendencia'] == 'crescente' else 'trend-down'}">
-                                {dados['tendencia'].capitalize()}
-                            </span>
-                        </div>
-                        <div class="col-md-6">
-                            <span class="metric-label">Confiança:</span>
-                            <span class="confidence {confianca_class}">{confianca_texto} (R²: {dados['r2']:.2f})</span>
-                        </div>
-                    </div>
-                    
-                    <div class="row">
-                        {html_previsoes}
-                    </div>
-                </div>
-            </div>
-            """)
+            # Montar card do colaborador (cards separados por quebra de linha)
+            if i:
+                buffer.write("\n")
+            _escrever_template(buffer, _TEMPLATE_PREVISAO_CARD, {
+                'colaborador': colaborador,
+                'classe_tendencia': classe_tendencia,
+                'tendencia': tendencia.capitalize(),
+                'confianca_class': confianca_class,
+                'confianca_texto': confianca_texto,
+                'r2': dados['r2'],
+                'html_previsoes': buffer_previsoes.getvalue()
+            })
         
-        return "\n".join(html_partes)
+        return buffer.getvalue()
 
-    def processar_dados_colaborador(self, nome, df):
-        """Processa os dados de um colaborador específico"""
-        try:
-            # Converter datas para datetime
-            df['Data'] = pd.to_datetime(df['DATA'], format='%d/%m/%Y', errors='coerce')
+    def gerar_html_metricas(self, metricas):
+        """Gera o HTML com o card de métricas de cada colaborador de um grupo"""
+        validos = {colaborador: dados for colaborador, dados in metricas.items() if dados}
+        if not validos:
+            return "<p>Não há métricas disponíveis para este grupo.</p>"
+        
+        buffer = io.StringIO()
+        for colaborador, dados in validos.items():
+            tendencia = dados.get('tendencia', {})
+            direcao = tendencia.get('direcao', 'estável')
+            _escrever_template(buffer, _TEMPLATE_METRICAS_CARD, {
+                'colaborador': colaborador,
+                'total_registros': dados.get('total_registros', 0),
+                'taxa_eficiencia': dados.get('taxa_eficiencia', 0),
+                'classe_tendencia': _CLASSE_TENDENCIA.get(direcao, 'trend-stable'),
+                'tendencia': direcao.capitalize(),
+                'r2': tendencia.get('r2', 0),
+                'distribuicao': " · ".join(
+                    f"{status}: {n}" for status, n in dados.get('distribuicao_status', {}).items()
+                )
+            })
+        
+        return buffer.getvalue()
+
+    def gerar_html_historico(self):
+        """Gera a tabela HTML com as análises registradas nesta sessão"""
+        if not self.historico_analises:
+            return "<p>Nenhuma análise registrada ainda.</p>"
+        
+        buffer = io.StringIO()
+        buffer.write('<table class="table table-sm">'
+                     '<thead><tr><th>Data</th><th>Colaboradores</th><th>Eficiência Média</th></tr></thead>'
+                     '<tbody>')
+        for analise in reversed(self.historico_analises):
+            _escrever_template(buffer, _TEMPLATE_HISTORICO_LINHA, analise)
+        buffer.write('\n            </tbody></table>')
+        return buffer.getvalue()
+
+    def gerar_scripts_plotly(self):
+        """Gera as chamadas Plotly.newPlot dos gráficos do dashboard (comparativo e previsões)"""
+        scripts = []
+        
+        # Eficiência média de cada grupo com dados
+        grupos = [(nome, tabela) for nome, tabela in (("Julio", self.df_julio), ("Leandro", self.df_leandro)) if len(tabela)]
+        if grupos:
+            dados = [{
+                'type': 'bar',
+                'x': [nome for nome, _ in grupos],
+                'y': [round(float(tabela['taxa_eficiencia'].mean()), 2) for _, tabela in grupos],
+                'name': 'Eficiência média (%)'
+            }]
+            scripts.append(_script_plotly('comparativo-grupos', dados, {'yaxis': {'title': 'Eficiência (%)'}}))
+        
+        # Previsões: próximo período (resumo) e histórico + previsões por colaborador
+        previsoes = [
+            (f"{colaborador} ({grupo})", resultado)
+            for grupo, resultados in self.resultados_preditivos.items()
+            for colaborador, resultado in resultados.items()
+        ]
+        if previsoes:
+            resumo = [{
+                'type': 'bar',
+                'x': [nome for nome, _ in previsoes],
+                'y': [round(resultado['previsoes'][0], 2) for _, resultado in previsoes],
+                'name': 'Próximo período (%)'
+            }]
+            scripts.append(_script_plotly('previsoes-resumo', resumo, {'yaxis': {'title': 'Eficiência prevista (%)'}}))
             
-            # Remover registros com datas inválidas
-            df = df.dropna(subset=['Data'])
+            linhas = [
+                {
+                    'type': 'scatter',
+                    'mode': 'lines+markers',
+                    'x': list(range(1, len(resultado['historico']) + len(resultado['previsoes']) + 1)),
+                    'y': [round(v, 2) for v in resultado['historico'] + resultado['previsoes']],
+                    'name': nome
+                }
+                for nome, resultado in previsoes
+            ]
+            scripts.append(_script_plotly('grafico-previsoes', linhas, {'xaxis': {'title': 'Análise'}, 'yaxis': {'title': 'Eficiência (%)'}}))
+        
+        return "\n        ".join(scripts)
+
+    @staticmethod
+    def processar_dados_colaborador(nome, df):
+        """Processa os dados de um colaborador específico (sem estado: roda direto nos processos do pool)"""
+        try:
+            # Converter datas para datetime (células de data do Excel já chegam convertidas)
+            if pd.api.types.is_datetime64_any_dtype(df['DATA']):
+                datas = df['DATA'].rename('Data')
+                # Abas do cache Parquet chegam como timestamp[pyarrow]; volta para datetime64 (API .dt completa)
+                if isinstance(datas.dtype, pd.ArrowDtype):
+                    datas = datas.astype(datas.dtype.numpy_dtype)
+            else:
+                # cache=True: cada texto de data distinto é convertido uma única vez
+                datas = pd.to_datetime(df['DATA'], format='%d/%m/%Y', errors='coerce', cache=True).rename('Data')
             
-            if len(df) == 0:
-                print(f"Nenhum registro com data válida encontrado para {nome}")
+            # Ignorar registros com datas inválidas (máscara aplicada só às colunas usadas, sem copiar a aba)
+            validas = datas.notna().to_numpy()
+            if not validas.any():
+                logger.info(f"Nenhum registro com data válida encontrado para {nome}")
                 return None
+            datas = datas[validas]
             
-            # Definir status com base nas colunas disponíveis
-            df['Status'] = 'PENDENTE'  # Status padrão
+            # Definir status com base nas colunas disponíveis (QUITADO prevalece sobre VERIFICADO)
+            sem_valor = np.zeros(len(datas), dtype=bool)
+            verificado = df['RESOLUÇÃO'].notna().to_numpy(dtype=bool)[validas] if 'RESOLUÇÃO' in df.columns else sem_valor
+            quitado = df['ÚLTIMO PAGAMENTO'].notna().to_numpy(dtype=bool)[validas] if 'ÚLTIMO PAGAMENTO' in df.columns else sem_valor
+            codigos = np.select([quitado, verificado], [2, 1], default=0).astype(np.uint8)
+            status = pd.Series(pd.Categorical.from_codes(codigos, categories=_STATUS), index=datas.index, name='Status')
             
-            if 'RESOLUÇÃO' in df.columns:
-                df.loc[df['RESOLUÇÃO'].notna(), 'Status'] = 'VERIFICADO'
-            
-            if 'ÚLTIMO PAGAMENTO' in df.columns:
-                df.loc[df['ÚLTIMO PAGAMENTO'].notna(), 'Status'] = 'QUITADO'
-            
-            # Calcular distribuição de status
-            distribuicao = df['Status'].value_counts().to_dict()
-            total_registros = len(df)
+            # Calcular distribuição de status (contagem direta dos códigos)
+            contagem_status = np.bincount(codigos, minlength=len(_STATUS))
+            distribuicao = {
+                rotulo: int(n) for rotulo, n in zip(_STATUS, contagem_status) if n
+            }
+            total_registros = len(datas)
             
             # Análise por data
-            analise_diaria = {}
-            for data, grupo in df.groupby('Data'):
-                data_str = data.strftime('%Y-%m-%d')
-                status_counts = grupo['Status'].value_counts().to_dict()
-                analise_diaria[data_str] = status_counts
+            contagem_diaria = pd.crosstab(datas, status)
+            # Formatar só as datas distintas (índice da tabela), não cada registro
+            analise_diaria = {
+                data_str: {status: n for status, n in contagens.items() if n}
+                for data_str, contagens in zip(contagem_diaria.index.strftime('%Y-%m-%d'), contagem_diaria.to_dict('records'))
+            }
 
             # Calcular médias diárias
-            dias_unicos = df['Data'].nunique()
+            dias_unicos = datas.nunique()
             medias_diarias = {status: round(count/dias_unicos, 1) 
                             for status, count in distribuicao.items()}
 
             # Análise de tendências
-            df_tendencia = df.groupby('Data').size().reset_index()
-            if len(df_tendencia) > 1:
-                X = np.arange(len(df_tendencia)).reshape(-1, 1)
-                y = df_tendencia[0].values
-                reg = LinearRegression().fit(X, y)
-                r2 = reg.score(X, y)
-                tendencia = 'crescente' if reg.coef_[0] > 0 else 'decrescente'
+            contagem_por_data = datas.value_counts(sort=False).sort_index()
+            if len(contagem_por_data) > 1:
+                x = np.arange(len(contagem_por_data), dtype=np.float64)
+                y = contagem_por_data.to_numpy(dtype=np.float64)
+                coeficiente, _, r2 = _ols_r2(x, y)
+                tendencia = 'crescente' if coeficiente > 0 else 'decrescente'
             else:
                 tendencia = 'estável'
                 r2 = 0
 
             # Análise semanal
-            df['DiaSemana'] = df['Data'].dt.day_name()
-            padrao_semanal = df['DiaSemana'].value_counts().to_dict()
+            contagem_semanal = np.bincount(datas.dt.dayofweek.to_numpy(), minlength=7)
+            padrao_semanal = {dia: int(n) for dia, n in zip(_DIAS_SEMANA, contagem_semanal) if n}
 
             # Calcular taxa de eficiência
-            total_processados = sum(v for k, v in distribuicao.items() 
-                                  if k in ['VERIFICADO', 'QUITADO'])
+            total_processados = int(contagem_status[1] + contagem_status[2])  # VERIFICADO + QUITADO
             taxa_eficiencia = (total_processados / total_registros) * 100 if total_registros > 0 else 0
 
             return {
@@ -930,20 +1309,55 @@ class AnalisadorAvancado:
                 'analise_diaria': analise_diaria
             }
         except Exception as e:
-            print(f"Erro ao processar aba {nome}: {str(e)}")
+            logger.error(f"Erro ao processar aba {nome}: {str(e)}")
             return None
 
+def _arquivos_historico():
+    """Arquivos do log de histórico, do mais antigo para o mais recente"""
+    if not os.path.isdir(HISTORICO_DIR):
+        return []
+    return sorted(
+        os.path.join(HISTORICO_DIR, nome)
+        for nome in os.listdir(HISTORICO_DIR)
+        if nome.endswith('.parquet')
+    )
+
+def _script_plotly(div_id, dados, layout):
+    """Chamada Plotly.newPlot de um gráfico do dashboard (dados serializados em JSON)"""
+    return (f"Plotly.newPlot('{div_id}', {json.dumps(dados, ensure_ascii=False)}, "
+            f"{json.dumps(layout, ensure_ascii=False)});")
+
+def _tabela_metricas(metricas):
+    """Monta a visão colunar (colaborador x métrica) das métricas de um grupo"""
+    validos = {colaborador: dados for colaborador, dados in metricas.items() if dados}
+    return pd.DataFrame(
+        {
+            'total_registros': np.fromiter((d.get('total_registros', 0) for d in validos.values()), dtype=np.int64, count=len(validos)),
+            'taxa_eficiencia': np.fromiter((d.get('taxa_eficiencia', 0) for d in validos.values()), dtype=np.float64, count=len(validos)),
+            'tendencia_direcao': [d.get('tendencia', {}).get('direcao') for d in validos.values()],
+            'tendencia_r2': np.fromiter((d.get('tendencia', {}).get('r2', 0) for d in validos.values()), dtype=np.float64, count=len(validos))
+        },
+        index=pd.Index(list(validos), name='colaborador', dtype=object)
+    )
+
+def _iniciar_worker():
+    """Pré-carrega as bibliotecas pesadas e o kernel de regressão em cada processo do pool"""
+    import pandas
+    import numpy
+    _ols_r2(np.arange(2, dtype=np.float64), np.arange(2, dtype=np.float64))
+
 if __name__ == "__main__":
-    # Inicializar analisador
-    analisador = AnalisadorAvancado()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
-    print("\nANÁLISE AVANÇADA DE DESEMPENHO")
-    print("=" * 50 + "\n")
-    
-    # Analisar arquivo do grupo JULIO
-    print("\nAnalisando grupo JULIO...")
-    analisador.analisar_arquivo("(JULIO) LISTAS INDIVIDUAIS.xlsx")
-    
-    # Analisar arquivo do grupo LEANDRO
-    print("\nAnalisando grupo LEANDRO...")
-    analisador.analisar_arquivo("(LEANDRO_ADRIANO) LISTAS INDIVIDUAIS.xlsx")
+    # Inicializar analisador (o pool de processos é encerrado ao sair do bloco)
+    with AnalisadorAvancado() as analisador:
+        print("\nANÁLISE AVANÇADA DE DESEMPENHO")
+        print("=" * 50 + "\n")
+        
+        # Analisar arquivo do grupo JULIO
+        print("\nAnalisando grupo JULIO...")
+        analisador.analisar_arquivo("(JULIO) LISTAS INDIVIDUAIS.xlsx")
+        
+        # Analisar arquivo do grupo LEANDRO
+        print("\nAnalisando grupo LEANDRO...")
+        analisador.analisar_arquivo("(LEANDRO_ADRIANO) LISTAS INDIVIDUAIS.xlsx")
@@ -9,43 +9,94 @@ na qualidade da análise baseada na coluna "SITUAÇÃO" de cada colaborador.
 """
 
 import os
+import io
+import hashlib
+import warnings
 import pandas as pd
 import numpy as np
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
-from collections import defaultdict, Counter
+from collections import Counter
+warnings.filterwarnings('ignore')
 
-# Importações locais
-from debug_excel import AnalisadorExcel
-from analise_360 import Analise360
-from data_analysis_pipeline import DataAnalysisPipeline
+try:
+    from numba import njit
+except ImportError:  # numba é opcional: sem ele o kernel roda em NumPy
+    njit = None
 
-def analisar_situacao_colaborador(nome_arquivo, nome_aba):
+CACHE_DIR = 'cache'
+
+# Valores aceitos na coluna SITUACAO
+_VALORES_PADRONIZADOS = frozenset({'PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE'})
+
+# Grafias da coluna SITUAÇÃO encontradas nas planilhas (todas normalizadas para SITUACAO)
+_NOMES_SITUACAO = ['SITUAÇÂO', 'SITUAÇÃO', 'SITUACAO']
+
+def _normalizar_colunas(colunas):
+    """Normaliza os nomes das colunas (maiúsculas, sem espaços nas pontas, SITUAÇÃO -> SITUACAO)"""
+    colunas = pd.Index(colunas).astype(str).str.strip().str.upper()
+    return colunas.where(~colunas.isin(_NOMES_SITUACAO), 'SITUACAO')
+
+def _coluna_relevante(coluna):
+    """Indica se a coluna é usada na análise (SITUAÇÃO ou alguma DATA), pelo nome já normalizado"""
+    coluna = _normalizar_colunas([coluna])[0]
+    return coluna == 'SITUACAO' or 'DATA' in coluna
+
+def _contar_transicoes(codigos, n_categorias):
+    """Matriz [de, para] com as transições entre códigos consecutivos (-1 = vazio)"""
+    anteriores = codigos[:-1]
+    atuais = codigos[1:]
+    mudou = (anteriores >= 0) & (atuais >= 0) & (anteriores != atuais)
+    pares = anteriores[mudou] * n_categorias + atuais[mudou]
+    return np.bincount(pares, minlength=n_categorias * n_categorias).reshape(n_categorias, n_categorias)
+
+if njit is not None:
+    _contar_transicoes = njit(cache=True)(_contar_transicoes)
+
+def _ler_abas(nome_arquivo, xls, abas):
+    """Lê as abas do Excel, reaproveitando o cache Parquet enquanto o arquivo não mudar"""
+    mtime = os.path.getmtime(nome_arquivo)
+    chave = hashlib.sha1(f"{os.path.abspath(nome_arquivo)}:{mtime}".encode()).hexdigest()
+    diretorio_cache = os.path.join(CACHE_DIR, chave)
+    os.makedirs(diretorio_cache, exist_ok=True)
+    caminhos_cache = {aba: os.path.join(diretorio_cache, f"{aba}.parquet") for aba in abas}
+    
+    planilhas = {
+        aba: pd.read_parquet(caminho)
+        for aba, caminho in caminhos_cache.items()
+        if os.path.exists(caminho)
+    }
+    
+    # Ler do Excel (de uma vez) apenas as abas sem cache
+    faltantes = [aba for aba in abas if aba not in planilhas]
+    if faltantes:
+        lidas = pd.read_excel(xls, sheet_name=faltantes, usecols=_coluna_relevante)
+        for aba, df in lidas.items():
+            try:
+                df.to_parquet(caminhos_cache[aba], compression='zstd')
+            except Exception as e:
+                # Colunas com tipos mistos não são serializáveis; a aba só fica sem cache
+                print(f"Aviso: aba {aba} não foi salva em cache: {str(e)}")
+        planilhas.update(lidas)
+    
+    # Manter a ordem das abas no arquivo
+    return {aba: planilhas[aba] for aba in abas}
+
+def analisar_situacao_colaborador(df, nome_aba, nome_arquivo):
     """
     Analisa a qualidade dos registros na coluna SITUAÇÃO para um colaborador específico.
     
     Args:
-        nome_arquivo (str): Caminho para o arquivo Excel
+        df (DataFrame): Dados da aba do colaborador, já lidos do arquivo
         nome_aba (str): Nome da aba/colaborador a ser analisada
+        nome_arquivo (str): Caminho do arquivo Excel de origem
         
     Returns:
         dict: Dicionário com métricas de qualidade dos registros
     """
     try:
-        # Carregar dados do colaborador
-        df = pd.read_excel(nome_arquivo, sheet_name=nome_aba)
-        
         # Normalizar nomes das colunas
-        colunas_normalizadas = []
-        for col in df.columns:
-            col_norm = str(col).strip().upper()
-            if col_norm in ['SITUAÇÂO', 'SITUAÇÃO']:
-                col_norm = 'SITUACAO'
-            colunas_normalizadas.append(col_norm)
-        
-        df.columns = colunas_normalizadas
+        df.columns = _normalizar_colunas(df.columns)
         
         # Verificar se a coluna SITUACAO existe
         if 'SITUACAO' not in df.columns:
@@ -56,33 +107,42 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
                 'status': 'FALHA'
             }
         
+        # SITUACAO como categoria: as operações seguintes trabalham sobre códigos inteiros
+        df['SITUACAO'] = df['SITUACAO'].astype('category')
+        
         # Análise de qualidade da coluna SITUACAO
         total_registros = len(df)
-        registros_vazios = df['SITUACAO'].isna().sum()
-        valores_unicos = df['SITUACAO'].dropna().unique()
-        contagem_valores = df['SITUACAO'].value_counts().to_dict()
+        # Uma única passada de hash: códigos por linha (-1 = vazio) e valores na ordem de aparição
+        codigos, valores_unicos = pd.factorize(df['SITUACAO'])
+        vazios = codigos < 0
+        registros_vazios = int(vazios.sum())
+        contagens = np.bincount(codigos[~vazios], minlength=len(valores_unicos))
+        ordem_contagem = np.argsort(-contagens, kind='stable')
+        contagem_valores = dict(zip(valores_unicos[ordem_contagem].tolist(), contagens[ordem_contagem].tolist()))
         
         # Verificar padrões de preenchimento
-        valores_padronizados = ['PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE']
-        valores_nao_padronizados = [v for v in valores_unicos if v not in valores_padronizados]
+        valores_nao_padronizados = [v for v in valores_unicos if v not in _VALORES_PADRONIZADOS]
         
-        # Verificar se há atualizações diárias
-        tem_data = False
+        # Verificar se há coluna de data (vale a última, como na varredura original)
+        colunas_data = [col for col in df.columns if 'DATA' in col]
+        tem_data = bool(colunas_data)
+        coluna_data = colunas_data[-1] if tem_data else None
         atualizacoes_diarias = {}
-        coluna_data = None
         
-        # Verificar se há coluna de data
-        for col in df.columns:
-            if 'DATA' in col:
-                tem_data = True
-                coluna_data = col
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                    # Agrupar por data e contar atualizações de status
-                    atualizacoes = df.groupby(df[col].dt.date)['SITUACAO'].count()
-                    atualizacoes_diarias = atualizacoes.to_dict()
-                except:
-                    pass
+        # Verificar se há atualizações diárias
+        if tem_data:
+            try:
+                if not pd.api.types.is_datetime64_any_dtype(df[coluna_data]):
+                    # Formato explícito: sem inferência por elemento nem fallback para o dateutil
+                    df[coluna_data] = pd.to_datetime(df[coluna_data], errors='coerce', format='%d/%m/%Y', cache=True)
+                # Contar atualizações de status por dia (datetime64, sem objetos date por linha)
+                dias = df[coluna_data].dt.floor('D')
+                atualizacoes = (dias[df['SITUACAO'].notna()].value_counts()
+                                .reindex(dias.dropna().unique(), fill_value=0)
+                                .sort_index())
+                atualizacoes_diarias = {dia.date(): int(qtd) for dia, qtd in atualizacoes.items()}
+            except:
+                pass
         
         # Calcular métricas de qualidade
         taxa_preenchimento = (total_registros - registros_vazios) / total_registros if total_registros > 0 else 0
@@ -91,9 +151,9 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
         # Verificar consistência nas atualizações diárias
         consistencia_diaria = 0
         if atualizacoes_diarias:
-            # Calcular desvio padrão das atualizações diárias
-            std_atualizacoes = np.std(list(atualizacoes_diarias.values()))
-            media_atualizacoes = np.mean(list(atualizacoes_diarias.values()))
+            # Calcular desvio padrão (populacional) das atualizações diárias direto na Series
+            std_atualizacoes = atualizacoes.std(ddof=0)
+            media_atualizacoes = atualizacoes.mean()
             
             # Coeficiente de variação (menor é melhor)
             if media_atualizacoes > 0:
@@ -106,69 +166,36 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             0.3 * consistencia_diaria   # 30% para consistência diária
         ) * 100
         
-        # Análise de transições de estado (se houver coluna de data)
+        # Análise de transições de estado e de tempo médio em cada situação (se houver coluna de data)
         analise_transicoes = {}
-        if tem_data and coluna_data and not df[coluna_data].isna().all():
-            # Ordenar por data
-            df_ordenado = df.sort_values(by=coluna_data)
+        tempos_medios = {}
+        if tem_data and df[coluna_data].notna().any():
+            # Ordenar por data uma única vez (estável, mantendo a ordem da planilha em empates)
+            datas = df[coluna_data].to_numpy()
+            ordem = np.argsort(datas, kind='stable')
+            datas_ordenadas = datas[ordem]
+            codigos_ordenados = df['SITUACAO'].cat.codes.to_numpy()[ordem]
+            categorias = df['SITUACAO'].cat.categories
             
-            # Verificar transições de estado
-            if 'SITUACAO' in df_ordenado.columns and len(df_ordenado) > 1:
-                transicoes = []
-                situacao_anterior = None
+            # Verificar transições de estado (comparando códigos; -1 = vazio)
+            if len(codigos_ordenados) > 1:
+                matriz = _contar_transicoes(codigos_ordenados.astype(np.int64), len(categorias))
                 
-                for idx, row in df_ordenado.iterrows():
-                    situacao_atual = row['SITUACAO']
-                    if pd.notna(situacao_anterior) and pd.notna(situacao_atual) and situacao_anterior != situacao_atual:
-                        transicoes.append((situacao_anterior, situacao_atual))
-                    situacao_anterior = situacao_atual
-                
-                # Contar transições
-                contagem_transicoes = Counter(transicoes)
-                analise_transicoes = {f"{de} -> {para}": contagem for (de, para), contagem in contagem_transicoes.items()}
-        
-        # Análise de tempo médio em cada situação
-        tempos_medios = {}
-        if tem_data and coluna_data and not df[coluna_data].isna().all():
-            # Agrupar por situação e calcular tempo médio
-            df_ordenado = df.sort_values(by=coluna_data)
-            df_ordenado['data_anterior'] = df_ordenado[coluna_data].shift(1)
-            df_ordenado['tempo_no_estado'] = (df_ordenado[coluna_data] - df_ordenado['data_anterior']).dt.days
+                # Montar o dicionário só com as transições que ocorreram
+                de, para = np.nonzero(matriz)
+                analise_transicoes = {f"{categorias[i]} -> {categorias[j]}": int(matriz[i, j])
+                                      for i, j in zip(de.tolist(), para.tolist())}
+            
+            # Dias desde o registro anterior (NaN no primeiro e quando alguma data é vazia)
+            intervalos = np.diff(datas_ordenadas).astype('timedelta64[D]')
+            tempo_no_estado = np.full(len(datas_ordenadas), np.nan)
+            tempo_no_estado[1:] = np.where(np.isnat(intervalos), np.nan, intervalos.astype(np.int64))
             
-            # Calcular tempo médio por situação
-            tempos_por_situacao = df_ordenado.groupby('SITUACAO')['tempo_no_estado'].mean()
+            # Agrupar por situação e calcular tempo médio
+            situacoes_ordenadas = pd.Categorical.from_codes(codigos_ordenados, categorias)
+            tempos_por_situacao = pd.Series(tempo_no_estado).groupby(situacoes_ordenadas, observed=True).mean()
             tempos_medios = tempos_por_situacao.to_dict()
         
-        # Gerar visualização da distribuição de situações
-        grafico_path = None
-        try:
-            if contagem_valores:
-                plt.figure(figsize=(10, 6))
-                sns.barplot(x=list(contagem_valores.keys()), y=list(contagem_valores.values()))
-                plt.title(f'Distribuição de Situações - {nome_aba}')
-                plt.xlabel('Situação')
-                plt.ylabel('Quantidade')
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                
-                # Salvar gráfico
-                diretorio_graficos = 'graficos_situacao'
-                if not os.path.exists(diretorio_graficos):
-                    try:
-                        os.makedirs(diretorio_graficos)
-                    except FileExistsError:
-                        # Diretório já existe, podemos continuar
-                        pass
-                
-                # Garantir que o nome do arquivo seja único
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                nome_arquivo_grafico = f'situacao_{nome_aba.replace(" ", "_")}_{timestamp}.png'
-                grafico_path = os.path.join(diretorio_graficos, nome_arquivo_grafico)
-                plt.savefig(grafico_path)
-                plt.close()
-        except Exception as e:
-            print(f"Erro ao gerar gráfico para {nome_aba}: {str(e)}")
-        
         # Identificar problemas e sugestões
         problemas = []
         sugestoes = []
@@ -203,7 +230,8 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             'score_qualidade': score_qualidade,
             'analise_transicoes': analise_transicoes,
             'tempos_medios': tempos_medios,
-            'grafico_path': grafico_path,
+            'contagem_valores': contagem_valores,
+            'grafico_path': None,
             'problemas': problemas,
             'sugestoes': sugestoes,
             'status': 'SUCESSO'
@@ -217,48 +245,107 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             'status': 'FALHA'
         }
 
-def analisar_arquivo_paralelo(nome_arquivo):
+def _gerar_graficos(resultados):
+    """Gera os gráficos de distribuição de situações reaproveitando uma única figura"""
+    # Importados só aqui: os workers não desenham e não precisam pagar o import do matplotlib
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    diretorio_graficos = 'graficos_situacao'
+    os.makedirs(diretorio_graficos, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    fig, ax = plt.subplots(figsize=(10, 6))
+    try:
+        for r in resultados:
+            try:
+                contagem_valores = r['contagem_valores']
+                ax.clear()
+                sns.barplot(x=list(contagem_valores.keys()), y=list(contagem_valores.values()), ax=ax)
+                ax.set_title(f'Distribuição de Situações - {r["colaborador"]}')
+                ax.set_xlabel('Situação')
+                ax.set_ylabel('Quantidade')
+                ax.tick_params(axis='x', rotation=45)
+                fig.tight_layout()
+                
+                nome_arquivo_grafico = f'situacao_{r["colaborador"].replace(" ", "_")}_{timestamp}.png'
+                grafico_path = os.path.join(diretorio_graficos, nome_arquivo_grafico)
+                fig.savefig(grafico_path)
+                r['grafico_path'] = grafico_path
+            except Exception as e:
+                print(f"Erro ao gerar gráfico para {r['colaborador']}: {str(e)}")
+    finally:
+        plt.close(fig)
+
+def analisar_arquivos_paralelo(nomes_arquivos):
     """
-    Analisa todas as abas de um arquivo Excel em paralelo.
+    Analisa todas as abas de vários arquivos Excel num único pool de processos.
     
     Args:
-        nome_arquivo (str): Caminho para o arquivo Excel
+        nomes_arquivos (list): Caminhos para os arquivos Excel
         
     Returns:
-        dict: Resultados da análise para cada colaborador
+        dict: Resultados da análise de cada arquivo, no formato de analisar_arquivo_paralelo
     """
+    resultados = {}
+    planilhas = {}
+    for nome_arquivo in nomes_arquivos:
+        try:
+            # Carregar arquivo Excel uma única vez; os workers recebem os DataFrames prontos
+            xls = pd.ExcelFile(nome_arquivo, engine='calamine')
+            
+            # Filtrar abas válidas (excluir relatórios gerais, etc.)
+            abas_validas = [aba for aba in xls.sheet_names if aba not in ["", "TESTE", "RELATÓRIO GERAL"]]
+            planilhas[nome_arquivo] = _ler_abas(nome_arquivo, xls, abas_validas)
+            resultados[nome_arquivo] = {}
+        except Exception as e:
+            resultados[nome_arquivo] = {'erro_geral': str(e)}
+    
+    total_abas = sum(len(abas) for abas in planilhas.values())
+    if total_abas == 0:
+        return resultados
+    
     try:
-        # Carregar arquivo Excel
-        xls = pd.ExcelFile(nome_arquivo)
-        
-        # Filtrar abas válidas (excluir relatórios gerais, etc.)
-        abas_validas = [aba for aba in xls.sheet_names if aba not in ["", "TESTE", "RELATÓRIO GERAL"]]
-        
-        resultados = {}
-        
-        # Usar ProcessPoolExecutor para paralelizar a análise
-        with ProcessPoolExecutor(max_workers=min(os.cpu_count(), len(abas_validas))) as executor:
-            # Criar tarefas para cada aba
-            tarefas = {executor.submit(analisar_situacao_colaborador, nome_arquivo, aba): aba for aba in abas_validas}
+        # Um só ProcessPoolExecutor para as abas de todos os arquivos
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count(), total_abas)) as executor:
+            # Criar tarefas para cada aba, identificadas por (arquivo, aba)
+            tarefas = {
+                executor.submit(analisar_situacao_colaborador, df, aba, nome_arquivo): (nome_arquivo, aba)
+                for nome_arquivo, abas in planilhas.items()
+                for aba, df in abas.items()
+            }
             
             # Processar resultados conforme são concluídos
             for tarefa in as_completed(tarefas):
-                aba = tarefas[tarefa]
+                nome_arquivo, aba = tarefas[tarefa]
                 try:
-                    resultado = tarefa.result()
-                    resultados[aba] = resultado
+                    resultados[nome_arquivo][aba] = tarefa.result()
                 except Exception as e:
-                    resultados[aba] = {
+                    resultados[nome_arquivo][aba] = {
                         'colaborador': aba,
                         'arquivo': nome_arquivo,
                         'erro': str(e),
                         'status': 'FALHA'
                     }
-        
-        return resultados
-    
     except Exception as e:
-        return {'erro_geral': str(e)}
+        for nome_arquivo in planilhas:
+            resultados[nome_arquivo] = {'erro_geral': str(e)}
+    
+    return resultados
+
+def analisar_arquivo_paralelo(nome_arquivo):
+    """
+    Analisa todas as abas de um arquivo Excel em paralelo.
+    
+    Args:
+        nome_arquivo (str): Caminho para o arquivo Excel
+        
+    Returns:
+        dict: Resultados da análise para cada colaborador
+    """
+    return analisar_arquivos_paralelo([nome_arquivo])[nome_arquivo]
 
 def gerar_relatorio_melhorias(resultados_julio, resultados_leandro):
     """
@@ -279,45 +366,28 @@ def gerar_relatorio_melhorias(resultados_julio, resultados_leandro):
     colaboradores_com_problemas = sum(1 for r in todos_resultados.values() 
                                      if r.get('status') == 'SUCESSO' and r.get('problemas'))
     
-    # Agrupar problemas comuns
-    todos_problemas = []
+    # Agrupar problemas e sugestões comuns numa única passada
+    contagem_problemas = Counter()
+    contagem_sugestoes = Counter()
     for r in todos_resultados.values():
-        if r.get('status') == 'SUCESSO' and r.get('problemas'):
-            todos_problemas.extend(r.get('problemas', []))
+        if r.get('status') == 'SUCESSO':
+            contagem_problemas.update(r.get('problemas') or ())
+            contagem_sugestoes.update(r.get('sugestoes') or ())
     
-    contagem_problemas = Counter(todos_problemas)
+    # Consolidar transições e tempos médios de todos os colaboradores com um groupby cada
+    series_transicoes = [pd.Series(r['analise_transicoes'], dtype='int64') for r in todos_resultados.values()
+                         if r.get('status') == 'SUCESSO' and r.get('analise_transicoes')]
+    series_tempos = [pd.Series(r['tempos_medios'], dtype='float64') for r in todos_resultados.values()
+                     if r.get('status') == 'SUCESSO' and r.get('tempos_medios')]
     
-    # Agrupar sugestões comuns
-    todas_sugestoes = []
-    for r in todos_resultados.values():
-        if r.get('status') == 'SUCESSO' and r.get('sugestoes'):
-            todas_sugestoes.extend(r.get('sugestoes', []))
-    
-    contagem_sugestoes = Counter(todas_sugestoes)
-    
-    # Coletar todas as transições de estado
     todas_transicoes = {}
-    for r in todos_resultados.values():
-        if r.get('status') == 'SUCESSO' and r.get('analise_transicoes'):
-            for transicao, contagem in r.get('analise_transicoes', {}).items():
-                if transicao in todas_transicoes:
-                    todas_transicoes[transicao] += contagem
-                else:
-                    todas_transicoes[transicao] = contagem
-    
-    # Coletar tempos médios em cada situação
-    todos_tempos_medios = defaultdict(list)
-    for r in todos_resultados.values():
-        if r.get('status') == 'SUCESSO' and r.get('tempos_medios'):
-            for situacao, tempo in r.get('tempos_medios', {}).items():
-                todos_tempos_medios[situacao].append(tempo)
-    
-    # Calcular média dos tempos médios
-    tempos_medios_consolidados = {
-        situacao: sum(tempos) / len(tempos) 
-        for situacao, tempos in todos_tempos_medios.items() 
-        if len(tempos) > 0
-    }
+    if series_transicoes:
+        todas_transicoes = pd.concat(series_transicoes).groupby(level=0, sort=False).sum().to_dict()
+    
+    # Média dos tempos médios (um NaN em qualquer colaborador mantém a situação como NaN)
+    tempos_medios_consolidados = {}
+    if series_tempos:
+        tempos_medios_consolidados = pd.concat(series_tempos).groupby(level=0, sort=False).mean(skipna=False).to_dict()
     
     # Identificar colaboradores com melhor e pior qualidade
     colaboradores_validos = [r for r in todos_resultados.values() 
@@ -330,6 +400,13 @@ def gerar_relatorio_melhorias(resultados_julio, resultados_leandro):
         melhor_colaborador = None
         pior_colaborador = None
     
+    # Renderizar apenas os gráficos exibidos no relatório (melhor, pior e até 10 no total)
+    com_grafico = [r for r in colaboradores_validos if r.get('contagem_valores')]
+    destaques = [r for r in (melhor_colaborador, pior_colaborador) if r is not None and r.get('contagem_valores')]
+    selecionados = list({id(r): r for r in destaques + com_grafico}.values())[:10]
+    if selecionados:
+        _gerar_graficos(selecionados)
+    
     # Coletar caminhos dos gráficos gerados
     graficos_gerados = [
         r.get('grafico_path') for r in todos_resultados.values()
@@ -337,111 +414,117 @@ def gerar_relatorio_melhorias(resultados_julio, resultados_leandro):
     ]
     
     # Gerar relatório
-    relatorio = []
-    relatorio.append("=" * 80)
-    relatorio.append("RELATÓRIO DE MELHORIAS NA QUALIDADE DA ANÁLISE")
-    relatorio.append("=" * 80)
-    relatorio.append(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-    relatorio.append(f"Total de Colaboradores Analisados: {total_colaboradores}")
-    relatorio.append(f"Colaboradores com Problemas Identificados: {colaboradores_com_problemas} ({colaboradores_com_problemas/total_colaboradores*100:.1f}%)")
-    relatorio.append(f"Gráficos Gerados: {len(graficos_gerados)}")
-    relatorio.append("")
-    
-    relatorio.append("-" * 80)
-    relatorio.append("PROBLEMAS MAIS COMUNS")
-    relatorio.append("-" * 80)
+    relatorio = io.StringIO()
+    escrever = relatorio.write
+    
+    def linha(texto=""):
+        escrever(texto)
+        escrever("\n")
+    
+    linha("=" * 80)
+    linha("RELATÓRIO DE MELHORIAS NA QUALIDADE DA ANÁLISE")
+    linha("=" * 80)
+    linha(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+    linha(f"Total de Colaboradores Analisados: {total_colaboradores}")
+    linha(f"Colaboradores com Problemas Identificados: {colaboradores_com_problemas} ({colaboradores_com_problemas/total_colaboradores*100:.1f}%)")
+    linha(f"Gráficos Gerados: {len(graficos_gerados)}")
+    linha()
+    
+    linha("-" * 80)
+    linha("PROBLEMAS MAIS COMUNS")
+    linha("-" * 80)
     for problema, contagem in contagem_problemas.most_common(5):
-        relatorio.append(f"• {problema}: {contagem} ocorrências ({contagem/total_colaboradores*100:.1f}% dos colaboradores)")
-    relatorio.append("")
+        linha(f"• {problema}: {contagem} ocorrências ({contagem/total_colaboradores*100:.1f}% dos colaboradores)")
+    linha()
     
-    relatorio.append("-" * 80)
-    relatorio.append("SUGESTÕES DE MELHORIA")
-    relatorio.append("-" * 80)
+    linha("-" * 80)
+    linha("SUGESTÕES DE MELHORIA")
+    linha("-" * 80)
     for sugestao, contagem in contagem_sugestoes.most_common(5):
-        relatorio.append(f"• {sugestao}")
-    relatorio.append("")
+        linha(f"• {sugestao}")
+    linha()
     
     if todas_transicoes:
-        relatorio.append("-" * 80)
-        relatorio.append("ANÁLISE DE TRANSIÇÕES DE ESTADO")
-        relatorio.append("-" * 80)
-        relatorio.append("Transições mais comuns entre estados:")
+        linha("-" * 80)
+        linha("ANÁLISE DE TRANSIÇÕES DE ESTADO")
+        linha("-" * 80)
+        linha("Transições mais comuns entre estados:")
         for transicao, contagem in sorted(todas_transicoes.items(), key=lambda x: x[1], reverse=True)[:5]:
-            relatorio.append(f"• {transicao}: {contagem} ocorrências")
-        relatorio.append("")
+            linha(f"• {transicao}: {contagem} ocorrências")
+        linha()
     
     if tempos_medios_consolidados:
-        relatorio.append("-" * 80)
-        relatorio.append("TEMPO MÉDIO EM CADA SITUAÇÃO")
-        relatorio.append("-" * 80)
+        linha("-" * 80)
+        linha("TEMPO MÉDIO EM CADA SITUAÇÃO")
+        linha("-" * 80)
         for situacao, tempo in sorted(tempos_medios_consolidados.items(), key=lambda x: x[1], reverse=True):
-            relatorio.append(f"• {situacao}: {tempo:.1f} dias")
-        relatorio.append("")
+            linha(f"• {situacao}: {tempo:.1f} dias")
+        linha()
     
     if melhor_colaborador and pior_colaborador:
-        relatorio.append("-" * 80)
-        relatorio.append("MELHORES PRÁTICAS")
-        relatorio.append("-" * 80)
-        relatorio.append(f"Colaborador com Melhor Qualidade: {melhor_colaborador['colaborador']}")
-        relatorio.append(f"Score de Qualidade: {melhor_colaborador['score_qualidade']:.1f}/100")
-        relatorio.append(f"Taxa de Preenchimento: {melhor_colaborador['taxa_preenchimento']:.1f}%")
-        relatorio.append(f"Taxa de Padronização: {melhor_colaborador['taxa_padronizacao']:.1f}%")
-        relatorio.append(f"Consistência Diária: {melhor_colaborador['consistencia_diaria']:.1f}%")
+        linha("-" * 80)
+        linha("MELHORES PRÁTICAS")
+        linha("-" * 80)
+        linha(f"Colaborador com Melhor Qualidade: {melhor_colaborador['colaborador']}")
+        linha(f"Score de Qualidade: {melhor_colaborador['score_qualidade']:.1f}/100")
+        linha(f"Taxa de Preenchimento: {melhor_colaborador['taxa_preenchimento']:.1f}%")
+        linha(f"Taxa de Padronização: {melhor_colaborador['taxa_padronizacao']:.1f}%")
+        linha(f"Consistência Diária: {melhor_colaborador['consistencia_diaria']:.1f}%")
         
         if melhor_colaborador.get('analise_transicoes'):
-            relatorio.append("Transições de Estado:")
+            linha("Transições de Estado:")
             for transicao, contagem in sorted(melhor_colaborador['analise_transicoes'].items(), 
                                              key=lambda x: x[1], reverse=True)[:3]:
-                relatorio.append(f"  - {transicao}: {contagem} ocorrências")
+                linha(f"  - {transicao}: {contagem} ocorrências")
         
         if melhor_colaborador.get('grafico_path'):
-            relatorio.append(f"Gráfico de Distribuição: {melhor_colaborador['grafico_path']}")
+            linha(f"Gráfico de Distribuição: {melhor_colaborador['grafico_path']}")
         
-        relatorio.append("")
+        linha()
         
-        relatorio.append("-" * 80)
-        relatorio.append("OPORTUNIDADES DE MELHORIA")
-        relatorio.append("-" * 80)
-        relatorio.append(f"Colaborador com Maior Oportunidade: {pior_colaborador['colaborador']}")
-        relatorio.append(f"Score de Qualidade: {pior_colaborador['score_qualidade']:.1f}/100")
-        relatorio.append(f"Taxa de Preenchimento: {pior_colaborador['taxa_preenchimento']:.1f}%")
-        relatorio.append(f"Taxa de Padronização: {pior_colaborador['taxa_padronizacao']:.1f}%")
-        relatorio.append(f"Consistência Diária: {pior_colaborador['consistencia_diaria']:.1f}%")
-        relatorio.append("Problemas Identificados:")
+        linha("-" * 80)
+        linha("OPORTUNIDADES DE MELHORIA")
+        linha("-" * 80)
+        linha(f"Colaborador com Maior Oportunidade: {pior_colaborador['colaborador']}")
+        linha(f"Score de Qualidade: {pior_colaborador['score_qualidade']:.1f}/100")
+        linha(f"Taxa de Preenchimento: {pior_colaborador['taxa_preenchimento']:.1f}%")
+        linha(f"Taxa de Padronização: {pior_colaborador['taxa_padronizacao']:.1f}%")
+        linha(f"Consistência Diária: {pior_colaborador['consistencia_diaria']:.1f}%")
+        linha("Problemas Identificados:")
         for problema in pior_colaborador.get('problemas', []):
-            relatorio.append(f"  - {problema}")
-        relatorio.append("Sugestões:")
+            linha(f"  - {problema}")
+        linha("Sugestões:")
         for sugestao in pior_colaborador.get('sugestoes', []):
-            relatorio.append(f"  - {sugestao}")
-    
-    relatorio.append("")
-    relatorio.append("-" * 80)
-    relatorio.append("RECOMENDAÇÕES GERAIS PARA MELHORAR A QUALIDADE DA ANÁLISE")
-    relatorio.append("-" * 80)
-    relatorio.append("1. Padronizar os valores da coluna SITUAÇÃO para facilitar análises comparativas")
-    relatorio.append("2. Garantir que todos os registros tenham a situação preenchida")
-    relatorio.append("3. Manter uma frequência consistente de atualizações diárias")
-    relatorio.append("4. Adicionar timestamps para cada atualização de status")
-    relatorio.append("5. Implementar validação de dados na entrada para evitar erros de digitação")
-    relatorio.append("6. Criar um dicionário de termos padronizados para referência dos colaboradores")
-    relatorio.append("7. Realizar treinamentos periódicos sobre a importância da qualidade dos dados")
-    relatorio.append("8. Implementar alertas automáticos para registros com dados incompletos")
+            linha(f"  - {sugestao}")
+    
+    linha()
+    linha("-" * 80)
+    linha("RECOMENDAÇÕES GERAIS PARA MELHORAR A QUALIDADE DA ANÁLISE")
+    linha("-" * 80)
+    linha("1. Padronizar os valores da coluna SITUAÇÃO para facilitar análises comparativas")
+    linha("2. Garantir que todos os registros tenham a situação preenchida")
+    linha("3. Manter uma frequência consistente de atualizações diárias")
+    linha("4. Adicionar timestamps para cada atualização de status")
+    linha("5. Implementar validação de dados na entrada para evitar erros de digitação")
+    linha("6. Criar um dicionário de termos padronizados para referência dos colaboradores")
+    linha("7. Realizar treinamentos periódicos sobre a importância da qualidade dos dados")
+    linha("8. Implementar alertas automáticos para registros com dados incompletos")
     
     if graficos_gerados:
-        relatorio.append("")
-        relatorio.append("-" * 80)
-        relatorio.append("GRÁFICOS GERADOS")
-        relatorio.append("-" * 80)
-        relatorio.append("Os seguintes gráficos foram gerados para análise visual:")
+        linha()
+        linha("-" * 80)
+        linha("GRÁFICOS GERADOS")
+        linha("-" * 80)
+        linha("Os seguintes gráficos foram gerados para análise visual:")
         for grafico in graficos_gerados[:10]:  # Limitar a 10 gráficos para não sobrecarregar o relatório
-            relatorio.append(f"• {grafico}")
+            linha(f"• {grafico}")
         if len(graficos_gerados) > 10:
-            relatorio.append(f"... e mais {len(graficos_gerados) - 10} gráficos")
+            linha(f"... e mais {len(graficos_gerados) - 10} gráficos")
     
-    relatorio.append("")
-    relatorio.append("=" * 80)
+    linha()
+    escrever("=" * 80)
     
-    return "\n".join(relatorio)
+    return relatorio.getvalue()
 
 def main():
     """Função principal para executar a análise em paralelo"""
@@ -451,11 +534,11 @@ def main():
     arquivo_julio = "(JULIO) LISTAS INDIVIDUAIS.xlsx"
     arquivo_leandro = "(LEANDRO_ADRIANO) LISTAS INDIVIDUAIS.xlsx"
     
-    print(f"Analisando arquivo: {arquivo_julio}")
-    resultados_julio = analisar_arquivo_paralelo(arquivo_julio)
-    
-    print(f"Analisando arquivo: {arquivo_leandro}")
-    resultados_leandro = analisar_arquivo_paralelo(arquivo_leandro)
+    # Os dois arquivos compartilham o mesmo pool de processos
+    print(f"Analisando arquivos: {arquivo_julio}, {arquivo_leandro}")
+    resultados = analisar_arquivos_paralelo([arquivo_julio, arquivo_leandro])
+    resultados_julio = resultados[arquivo_julio]
+    resultados_leandro = resultados[arquivo_leandro]
     
     # Gerar relatório de melhorias
     relatorio = gerar_relatorio_melhorias(resultados_julio, resultados_leandro)
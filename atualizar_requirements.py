@@ -1,13 +1,14 @@
-import pkg_resources
+from importlib.metadata import distributions
 import os
 
 def criar_requirements_atualizado():
     """Cria um novo requirements.txt com as versões exatas instaladas"""
     
-    # Obter pacotes instalados
+    # Obter pacotes instalados (nomes normalizados como as chaves do pkg_resources)
     installed_packages = {
-        pkg.key: pkg.version 
-        for pkg in pkg_resources.working_set
+        dist.metadata['Name'].lower().replace('_', '-'): dist.version
+        for dist in distributions()
+        if dist.metadata['Name']
     }
     
     # Template com as dependências necessárias e suas versões
@@ -5,38 +5,115 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+import json
+import hashlib
 import warnings
 warnings.filterwarnings('ignore')
 
+# Cache Parquet das planilhas auditadas (uma pasta por versão do arquivo)
+CACHE_DIR = os.path.join('cache', 'auditoria')
+
+# Assinaturas de arquivo: .xlsx/.xlsm são ZIP, .xls é OLE2
+_ASSINATURAS_EXCEL = (b'PK\x03\x04', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1')
+
+# Limite de colunas no gráfico de nulos (as com mais nulos primeiro)
+_MAX_COLUNAS_NULOS = 50
+
+# Valores aceitos na coluna Status
+_STATUS_VALIDOS = frozenset({'VERIFICADO', 'ANÁLISE', 'PENDENTE', 'PRIORIDADE', 'PRIORIDADE TOTAL',
+                             'APROVADO', 'QUITADO', 'APREENDIDO', 'CANCELADO'})
+
+def _mtime(caminho):
+    """Data de modificação do arquivo (None se não existir)"""
+    return os.path.getmtime(caminho) if os.path.exists(caminho) else None
+
+def _sanitize(rec_df, **kwargs):
+    """Registros do DataFrame só com tipos JSON (datas em ISO, NaN/NaT em None), com os nomes originais das colunas"""
+    linhas = json.loads(rec_df.to_json(orient='values', date_format='iso', **kwargs))
+    return [dict(zip(rec_df.columns, linha)) for linha in linhas]
+
+def _estatisticas(df):
+    """describe() de todas as colunas em tipos JSON, indexado pelo nome original de cada coluna"""
+    descricao = df.describe(include='all')
+    return dict(zip(descricao.columns, _sanitize(descricao.T, double_precision=4)))
+
 class AuditorDados:
-    def __init__(self):
+    def __init__(self, incluir_estatisticas=True):
         self.arquivos = {
             'JULIO': "F:/okok/(JULIO) LISTAS INDIVIDUAIS.xlsx",
             'LEANDRO': "F:/okok/(LEANDRO_ADRIANO) LISTAS INDIVIDUAIS.xlsx"
         }
         self.relatorio_completo = {}
+        # describe(include='all') é caro em abas largas; o dashboard não o exibe
+        self.incluir_estatisticas = incluir_estatisticas
+        self._wb_cache = {}
         
     def validar_arquivo(self, nome_arquivo, caminho):
-        """Valida se o arquivo existe e pode ser lido"""
+        """Valida se o arquivo existe e tem assinatura de planilha (a leitura fica para o relatório)"""
         if not os.path.exists(caminho):
             return False, f"Arquivo {nome_arquivo} não encontrado em {caminho}"
         try:
-            pd.read_excel(caminho, sheet_name=None)
-            return True, f"Arquivo {nome_arquivo} validado com sucesso"
-        except Exception as e:
+            with open(caminho, 'rb') as f:
+                cabecalho = f.read(8)
+        except OSError as e:
             return False, f"Erro ao ler arquivo {nome_arquivo}: {str(e)}"
+        if not cabecalho.startswith(_ASSINATURAS_EXCEL):
+            return False, f"Erro ao ler arquivo {nome_arquivo}: formato de planilha Excel não reconhecido"
+        return True, f"Arquivo {nome_arquivo} validado com sucesso"
+    
+    def _carregar_planilhas(self, caminho):
+        """Lê todas as abas uma única vez, com cache Parquet por (caminho, mtime, tamanho)"""
+        info = os.stat(caminho)
+        chave = hashlib.sha1(f"{os.path.abspath(caminho)}:{info.st_mtime_ns}:{info.st_size}".encode()).hexdigest()
+        chave_memoria, abas = self._wb_cache.get(caminho, (None, None))
+        if chave_memoria == chave:
+            return abas
+        
+        diretorio = os.path.join(CACHE_DIR, chave)
+        indice = os.path.join(diretorio, 'abas.json')
+        if os.path.exists(indice):
+            with open(indice, encoding='utf-8') as f:
+                nomes_abas = json.load(f)
+            abas = {}
+            for i, aba in enumerate(nomes_abas):
+                caminho_aba = os.path.join(diretorio, f"{i}.parquet")
+                if os.path.exists(caminho_aba):
+                    abas[aba] = pd.read_parquet(caminho_aba)
+            # Abas que não puderam ir para o cache são lidas do Excel
+            faltantes = [aba for aba in nomes_abas if aba not in abas]
+            if faltantes:
+                abas.update(pd.read_excel(caminho, sheet_name=faltantes, engine='calamine'))
+            abas = {aba: abas[aba] for aba in nomes_abas}
+        else:
+            abas = pd.read_excel(caminho, sheet_name=None, engine='calamine')
+            os.makedirs(diretorio, exist_ok=True)
+            for i, df in enumerate(abas.values()):
+                try:
+                    df.to_parquet(os.path.join(diretorio, f"{i}.parquet"), compression='zstd')
+                except Exception:
+                    # Colunas com tipos mistos não são serializáveis; a aba só fica sem cache
+                    pass
+            # O índice é gravado por último: só conta como cache completo depois das abas
+            with open(indice, 'w', encoding='utf-8') as f:
+                json.dump(list(abas), f, ensure_ascii=False)
+        
+        self._wb_cache[caminho] = (chave, abas)
+        return abas
     
     def analisar_aba(self, df, nome_aba):
         """Análise detalhada de uma aba específica"""
+        # Nulos e únicos de todas as colunas numa redução só cada
+        nulos = df.isna().sum()
+        unicos = df.nunique()
         analise = {
             'total_linhas': len(df),
             'total_colunas': len(df.columns),
             'colunas': list(df.columns),
-            'tipos_dados': df.dtypes.to_dict(),
-            'valores_nulos': df.isnull().sum().to_dict(),
-            'valores_unicos': {col: df[col].nunique() for col in df.columns},
-            'amostra_dados': df.head(5).to_dict('records'),
-            'estatisticas': df.describe(include='all').to_dict(),
+            'tipos_dados': df.dtypes.astype(str).to_dict(),
+            'valores_nulos': nulos.to_dict(),
+            'valores_unicos': unicos.to_dict(),
+            'amostra_dados': _sanitize(df.head(5)),
+            'estatisticas': _estatisticas(df) if self.incluir_estatisticas else {},
             'problemas_detectados': []
         }
         
@@ -48,9 +125,11 @@ class AuditorDados:
                 analise['problemas_detectados'].append("Erro na conversão de datas")
                 
         if 'Status' in df.columns:
-            status_invalidos = df[~df['Status'].isin(['VERIFICADO', 'ANÁLISE', 'PENDENTE', 'PRIORIDADE', 
-                                                     'PRIORIDADE TOTAL', 'APROVADO', 'QUITADO', 'APREENDIDO', 'CANCELADO'])]['Status'].unique()
-            if len(status_invalidos) > 0:
+            # Filtra só a coluna Status (sem copiar as demais) e só quando há inválidos
+            status = df['Status']
+            validos = status.isin(_STATUS_VALIDOS)
+            if not validos.all():
+                status_invalidos = status[~validos].unique()
                 analise['problemas_detectados'].append(f"Status inválidos encontrados: {status_invalidos}")
         
         return analise
@@ -64,8 +143,13 @@ class AuditorDados:
             
             if self.relatorio_completo[nome]['status_arquivo'][0]:
                 try:
-                    # Lê todas as abas
-                    excel_file = pd.read_excel(caminho, sheet_name=None)
+                    # Lê todas as abas (uma única vez, reaproveitando o cache Parquet)
+                    excel_file = self._carregar_planilhas(caminho)
+                except Exception as e:
+                    self.relatorio_completo[nome]['status_arquivo'] = (False, f"Erro ao ler arquivo {nome}: {str(e)}")
+                    continue
+                
+                try:
                     self.relatorio_completo[nome]['abas'] = {}
                     
                     for aba_nome, df in excel_file.items():
@@ -79,8 +163,11 @@ class AuditorDados:
         st.title("📊 Relatório de Auditoria de Dados")
         st.write("Análise detalhada das planilhas de dados")
         
-        # Gera o relatório
-        self.gerar_relatorio_auditoria()
+        # Gera o relatório (em cache entre reruns enquanto os arquivos não mudarem)
+        self.relatorio_completo = _montar_relatorio(
+            tuple((nome, caminho, _mtime(caminho)) for nome, caminho in self.arquivos.items()),
+            self.incluir_estatisticas
+        )
         
         # Para cada arquivo
         for nome_arquivo, dados in self.relatorio_completo.items():
@@ -106,12 +193,12 @@ class AuditorDados:
                         
                         # Análise de colunas
                         st.subheader("📋 Estrutura de Dados")
+                        # Colunas montadas direto das Series alinhadas pelo nome da coluna
                         df_estrutura = pd.DataFrame({
-                            'Coluna': analise_aba['colunas'],
-                            'Tipo': [str(analise_aba['tipos_dados'][col]) for col in analise_aba['colunas']],
-                            'Valores Nulos': [analise_aba['valores_nulos'][col] for col in analise_aba['colunas']],
-                            'Valores Únicos': [analise_aba['valores_unicos'][col] for col in analise_aba['colunas']]
-                        })
+                            'Tipo': pd.Series(analise_aba['tipos_dados'], dtype=object).astype(str),
+                            'Valores Nulos': pd.Series(analise_aba['valores_nulos']),
+                            'Valores Únicos': pd.Series(analise_aba['valores_unicos'])
+                        }).rename_axis('Coluna').reset_index()
                         st.dataframe(df_estrutura)
                         
                         # Problemas detectados
@@ -124,11 +211,9 @@ class AuditorDados:
                         
                         # Visualização de dados nulos
                         st.subheader("📉 Análise de Dados Nulos")
-                        df_nulos = pd.DataFrame(list(analise_aba['valores_nulos'].items()), 
-                                              columns=['Coluna', 'Valores Nulos'])
-                        fig = px.bar(df_nulos, x='Coluna', y='Valores Nulos',
-                                   title="Distribuição de Valores Nulos por Coluna")
-                        st.plotly_chart(fig)
+                        fig = _grafico_nulos(tuple(analise_aba['valores_nulos'].items()))
+                        st.plotly_chart(fig, use_container_width=True,
+                                        key=f"nulos_{nome_arquivo}_{nome_aba}")
                         
                         # Amostra de dados
                         st.subheader("🔍 Amostra de Dados")
@@ -161,6 +246,24 @@ class AuditorDados:
                         title="Comparativo de Volume de Dados por Aba")
             st.plotly_chart(fig)
 
+# Relatório em cache: a chave inclui o mtime, então arquivos editados invalidam o cache
+@st.cache_data(show_spinner=False)
+def _montar_relatorio(arquivos, incluir_estatisticas):
+    auditor = AuditorDados(incluir_estatisticas)
+    auditor.arquivos = {nome: caminho for nome, caminho, _ in arquivos}
+    auditor.gerar_relatorio_auditoria()
+    return auditor.relatorio_completo
+
+# Figura em cache pelo conteúdo da aba: reruns reaproveitam o mesmo objeto
+@st.cache_data(show_spinner=False)
+def _grafico_nulos(valores_nulos):
+    nulos = pd.Series(dict(valores_nulos), dtype='int64').nlargest(_MAX_COLUNAS_NULOS)
+    return go.Figure(
+        data=[go.Bar(x=[str(col) for col in nulos.index], y=nulos.tolist())],
+        layout=dict(title="Distribuição de Valores Nulos por Coluna",
+                    xaxis_title='Coluna', yaxis_title='Valores Nulos')
+    )
+
 if __name__ == "__main__":
-    auditor = AuditorDados()
+    auditor = AuditorDados(incluir_estatisticas=False)
     auditor.mostrar_dashboard_auditoria()
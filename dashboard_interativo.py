@@ -33,17 +33,15 @@ def normalizar_coluna(coluna):
 @st.cache_data
 def carregar_dados(arquivo):
     try:
-        # Carregar todas as abas do arquivo Excel
-        xls = pd.ExcelFile(arquivo)
+        # Carregar todas as abas do arquivo Excel (calamine, em Rust, evita o parser XML do openpyxl)
+        xls = pd.ExcelFile(arquivo, engine='calamine')
         
         # Filtrar abas válidas (excluir abas de teste ou relatório geral)
         abas_validas = [aba for aba in xls.sheet_names if aba not in ["", "TESTE", "RELATÓRIO GERAL"]]
         
         dados_colaboradores = {}
-        for aba in abas_validas:
-            # Carregar dados da aba
-            df = pd.read_excel(arquivo, sheet_name=aba)
-            
+        # Ler todas as abas válidas de uma vez a partir do arquivo já aberto
+        for aba, df in pd.read_excel(xls, sheet_name=abas_validas).items():
             # Normalizar nomes das colunas
             df.columns = [normalizar_coluna(col) for col in df.columns]
             
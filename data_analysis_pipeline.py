@@ -158,6 +158,9 @@ class DataAnalysisPipeline:
         except Exception as e:
             logger.error(f"Data extraction failed: {str(e)}")
             raise
+        finally:
+            # Release the analyzer's worker processes; later steps don't re-read the files
+            self.analisador.close()
     
     def _transform_data(self):
         """Transform and clean the extracted data."""
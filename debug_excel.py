@@ -8,7 +8,8 @@ from scipy import stats
 class AnalisadorExcel:
     def __init__(self, file_path):
         self.file_path = file_path
-        self.xls = pd.ExcelFile(file_path)
+        # Calamine (Rust) lê o xlsx bem mais rápido que o openpyxl
+        self.xls = pd.ExcelFile(file_path, engine='calamine')
         self.colaboradores = {}
         self.metricas_gerais = {}
         
@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from analise_360 import Analise360, _calcular_scores, _score_kernel
+
+@pytest.fixture
+def colaboradores():
+    """Metrics in the shape produced by AnalisadorExcel, covering the score edge cases"""
+    return {
+        'ANA': {
+            'taxa_eficiencia': 0.5,
+            'distribuicao_status': {'QUITADO': 10, 'PENDENTE': 5, 'VERIFICADO': 5},
+            'tempo_medio_resolucao': 4,
+            'tendencias': {'slope': 0.3}
+        },
+        'BRUNO': {  # no resolution time, falling trend
+            'taxa_eficiencia': 0.2,
+            'distribuicao_status': {'PENDENTE': 8, 'APROVADO': 2},
+            'tempo_medio_resolucao': None,
+            'tendencias': {'slope': -1.0}
+        },
+        'CARLA': {  # resolution time above the 10-day cap, no trend data
+            'taxa_eficiencia': 0.9,
+            'distribuicao_status': {'QUITADO': 7},
+            'tempo_medio_resolucao': 15
+        },
+        'DIEGO': {  # everything pending, zero slope
+            'taxa_eficiencia': 0.0,
+            'distribuicao_status': {'PENDENTE': 3},
+            'tempo_medio_resolucao': 10,
+            'tendencias': {'slope': 0}
+        }
+    }
+
+def _fatores(colaboradores):
+    linhas = Analise360()._process_group('JULIO', SimpleNamespace(colaboradores=colaboradores))
+    return [np.asarray(coluna, dtype=np.float64) for coluna in zip(*(fatores for _, _, fatores, _ in linhas))]
+
+@pytest.mark.parametrize('calcular', [_calcular_scores, _score_kernel])
+def test_vectorized_scores_match_calcular_score(colaboradores, calcular):
+    esperado = [Analise360().calcular_score(metricas) for metricas in colaboradores.values()]
+
+    np.testing.assert_allclose(calcular(*_fatores(colaboradores)), esperado)
+
+@pytest.fixture
+def arquivos(tmp_path):
+    """Two small group workbooks in the layout of the LISTAS INDIVIDUAIS files"""
+    import pandas as pd
+
+    def aba(n, inicio):
+        return pd.DataFrame({
+            'DATA': [f"{(inicio + i) % 28 + 1:02d}/01/2024" for i in range(n)],
+            'RESOLUÇÃO': [f"{(inicio + i) % 28 + 1:02d}/02/2024" for i in range(n)],
+            'SITUAÇÃO': [('PENDENTE', 'QUITADO', 'VERIFICADO', 'APROVADO')[(inicio + i) % 4] for i in range(n)]
+        })
+
+    caminhos = {}
+    for grupo, colaboradores in (('JULIO', ['ANA', 'BRUNO']), ('LEANDRO', ['CARLA'])):
+        caminho = tmp_path / f"({grupo}) LISTAS INDIVIDUAIS.xlsx"
+        with pd.ExcelWriter(caminho) as writer:
+            pd.DataFrame({'x': [1]}).to_excel(writer, sheet_name='RELATÓRIO GERAL', index=False)
+            for i, colaborador in enumerate(colaboradores):
+                aba(8 + i, i).to_excel(writer, sheet_name=colaborador, index=False)
+        caminhos[grupo] = str(caminho)
+    return caminhos
+
+def test_gerar_ranking_leaves_collaborators_for_sidebar(arquivos):
+    analise = Analise360()
+    analise.configurar_arquivos(arquivos)
+
+    df_ranking = analise.gerar_ranking()
+
+    assert sorted(df_ranking['Colaborador']) == ['ANA', 'BRUNO', 'CARLA']
+    # The sidebar lists names from the cached metrics; the instance analyzers must agree
+    assert list(analise._colaboradores['JULIO']) == ['ANA', 'BRUNO']
+    assert list(analise._colaboradores['LEANDRO']) == ['CARLA']
+    assert list(analise.analisador_julio.colaboradores) == ['ANA', 'BRUNO']
+    assert list(analise.analisador_leandro.colaboradores) == ['CARLA']
+    assert analise.overview_colaborador('BRUNO', 'JULIO')['Colaborador'] == 'BRUNO'
@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+import analise_avancada
+from analise_avancada import AnalisadorAvancado, MAX_HISTORICO, _INDICE_COLABORADOR, _ols_r2, _ols_r2_lote
+
+def _r2(y, y_pred):
+    """R² as in sklearn.metrics.r2_score (1.0 for a perfectly fitted constant series)"""
+    ss_res = ((y - y_pred) ** 2).sum()
+    ss_tot = ((y - y.mean()) ** 2).sum()
+    if ss_tot == 0:
+        return 1.0 if np.isclose(ss_res, 0) else 0.0
+    return 1 - ss_res / ss_tot
+
+@pytest.mark.parametrize('y', [
+    [30.3, 18.8, 23.1, 14.5, 10.9],
+    [50.0, 52.5, 55.0, 57.5],
+    [40.0, 40.0, 40.0]
+])
+def test_ols_r2_matches_polyfit(y):
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(len(y), dtype=np.float64)
+    coeficiente_esperado, intercepto_esperado = np.polyfit(x, y, 1)
+
+    coeficiente, intercepto, r2 = _ols_r2(x, y)
+
+    assert coeficiente == pytest.approx(coeficiente_esperado, abs=1e-9)
+    assert intercepto == pytest.approx(intercepto_esperado, abs=1e-9)
+    assert r2 == pytest.approx(_r2(y, np.polyval([coeficiente_esperado, intercepto_esperado], x)), abs=1e-9)
+
+def test_ols_r2_lote_matches_per_column_fits():
+    # History matrix [analysis, collaborator] with gaps, as built by realizar_analise_preditiva
+    Y = np.array([
+        [30.3, np.nan, 40.0, 12.0],
+        [18.8, 50.0, 40.0, np.nan],
+        [23.1, 52.5, 40.0, 15.0],
+        [14.5, 55.0, 40.0, 11.0],
+        [10.9, np.nan, 40.0, 19.5]
+    ])
+    x = np.arange(len(Y), dtype=np.float64)
+
+    coeficientes, interceptos, r2s = _ols_r2_lote(x, Y)
+
+    for j in range(Y.shape[1]):
+        validos = ~np.isnan(Y[:, j])
+        esperado = _ols_r2(x[validos], Y[validos, j])
+        np.testing.assert_allclose((coeficientes[j], interceptos[j], r2s[j]), esperado, atol=1e-9)
+
+def test_historico_keeps_last_analyses_on_disk_and_in_buffer(tmp_path, monkeypatch):
+    monkeypatch.setattr(analise_avancada, 'HISTORICO_DIR', str(tmp_path / 'historico'))
+    total = MAX_HISTORICO + 3
+
+    with AnalisadorAvancado() as analisador:
+        for i in range(total):
+            analisador.ultima_analise = datetime(2024, 1, 1) + timedelta(minutes=i)
+            analisador.metricas_julio = {'FELIPE': {'taxa_eficiencia': float(i), 'total_registros': 10}}
+            analisador._registrar_historico()
+
+        historico = analisador._historico_eficiencia()
+
+    # Only the newest analyses survive, oldest first, both in memory and on disk
+    esperado = np.arange(total - MAX_HISTORICO, total, dtype=np.float32)
+    np.testing.assert_array_equal(historico[:, _INDICE_COLABORADOR['FELIPE']], esperado)
+    assert len(list((tmp_path / 'historico').iterdir())) == MAX_HISTORICO
+
+    # A new analyzer restores the same buffer from the log
+    with AnalisadorAvancado() as recarregado:
+        np.testing.assert_array_equal(recarregado._historico_eficiencia(), historico)
+
+def test_cached_sheets_give_same_metrics_without_parsing_dates(tmp_path, monkeypatch):
+    monkeypatch.setattr(analise_avancada, 'CACHE_DIR', str(tmp_path / 'cache'))
+    n = 40
+    df = pd.DataFrame({
+        'DATA': pd.to_datetime('2024-01-01') + pd.to_timedelta(np.arange(n) % 9, unit='D'),
+        'RESOLUÇÃO': ['x' if i % 2 else None for i in range(n)],
+        'ÚLTIMO PAGAMENTO': ['y' if i % 5 == 0 else None for i in range(n)]
+    })
+    caminho = tmp_path / 'abas.xlsx'
+    df.to_excel(caminho, sheet_name='FELIPE', index=False)
+
+    with AnalisadorAvancado() as analisador:
+        excel_file = pd.ExcelFile(caminho, engine='calamine')
+        lida = analisador._ler_abas(str(caminho), excel_file, ['FELIPE'])['FELIPE']
+        em_cache = analisador._ler_abas(str(caminho), excel_file, ['FELIPE'])['FELIPE']
+
+    # Date cells already come as datetimes, from Excel or from the cache: no text parsing needed
+    def sem_parse(*args, **kwargs):
+        raise AssertionError('pd.to_datetime chamado')
+    monkeypatch.setattr(analise_avancada.pd, 'to_datetime', sem_parse)
+
+    esperado = AnalisadorAvancado.processar_dados_colaborador('FELIPE', lida)
+    assert esperado is not None
+    assert AnalisadorAvancado.processar_dados_colaborador('FELIPE', em_cache) == esperado
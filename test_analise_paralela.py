@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+import pandas as pd
+from collections import Counter
+from analise_paralela import analisar_situacao_colaborador
+
+VALORES_PADRONIZADOS = ['PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE']
+
+@pytest.fixture
+def sample_df():
+    """One collaborator sheet with empty and non-standard SITUAÇÃO values and distinct dates"""
+    situacoes = ['PENDENTE', 'QUITADO', None, 'PENDENTE', 'Em analise', 'VERIFICADO',
+                 'VERIFICADO', None, 'QUITADO', 'PENDENTE', 'ok', 'PENDENTE']
+    dias = np.cumsum([0, 2, 1, 3, 1, 1, 2, 1, 1, 2, 1, 4])
+    ordem = np.random.default_rng(0).permutation(len(situacoes))  # rows out of date order
+    return pd.DataFrame({
+        ' Situação ': np.array(situacoes, dtype=object)[ordem],
+        'DATA': (pd.Timestamp('2024-01-01') + pd.to_timedelta(dias, unit='D'))[ordem]
+    })
+
+def _referencia(df):
+    """Row-by-row formulas of the original implementation (iterrows, groupby on dates, np.std)"""
+    df = df.copy()
+    df.columns = ['SITUACAO' if str(c).strip().upper() in ('SITUAÇÂO', 'SITUAÇÃO', 'SITUACAO') else str(c).strip().upper()
+                  for c in df.columns]
+    total = len(df)
+    vazios = df['SITUACAO'].isna().sum()
+    unicos = df['SITUACAO'].dropna().unique()
+    nao_padronizados = [v for v in unicos if v not in VALORES_PADRONIZADOS]
+    atualizacoes = df.groupby(df['DATA'].dt.date)['SITUACAO'].count().to_dict()
+
+    taxa_preenchimento = (total - vazios) / total
+    taxa_padronizacao = (len(unicos) - len(nao_padronizados)) / len(unicos)
+    valores = list(atualizacoes.values())
+    consistencia = 1 - min(1, np.std(valores) / np.mean(valores))
+
+    ordenado = df.sort_values(by='DATA')
+    transicoes = []
+    anterior = None
+    for _, row in ordenado.iterrows():
+        atual = row['SITUACAO']
+        if pd.notna(anterior) and pd.notna(atual) and anterior != atual:
+            transicoes.append((anterior, atual))
+        anterior = atual
+
+    ordenado['tempo_no_estado'] = (ordenado['DATA'] - ordenado['DATA'].shift(1)).dt.days
+    tempos = ordenado.groupby('SITUACAO')['tempo_no_estado'].mean().to_dict()
+
+    return {
+        'total_registros': total,
+        'registros_vazios': vazios,
+        'taxa_preenchimento': taxa_preenchimento * 100,
+        'valores_unicos': set(unicos),
+        'valores_nao_padronizados': set(nao_padronizados),
+        'taxa_padronizacao': taxa_padronizacao * 100,
+        'atualizacoes_diarias': atualizacoes,
+        'consistencia_diaria': consistencia * 100,
+        'score_qualidade': (0.4 * taxa_preenchimento + 0.3 * taxa_padronizacao + 0.3 * consistencia) * 100,
+        'analise_transicoes': {f"{de} -> {para}": n for (de, para), n in Counter(transicoes).items()},
+        'tempos_medios': tempos
+    }
+
+def test_analisar_situacao_matches_original_formulas(sample_df):
+    esperado = _referencia(sample_df)
+
+    resultado = analisar_situacao_colaborador(sample_df.copy(), 'ANA', 'teste.xlsx')
+
+    assert resultado['status'] == 'SUCESSO'
+    assert set(resultado['valores_unicos']) == esperado.pop('valores_unicos')
+    assert set(resultado['valores_nao_padronizados']) == esperado.pop('valores_nao_padronizados')
+    assert resultado['tempos_medios'] == pytest.approx(esperado.pop('tempos_medios'))
+    for chave, valor in esperado.items():
+        assert resultado[chave] == pytest.approx(valor), chave
@@ -0,0 +1,32 @@
+import json
+import numpy as np
+import pandas as pd
+from auditoria_dados import AuditorDados, _sanitize
+
+def _sample_df():
+    return pd.DataFrame({
+        2023: [1, 2, None],
+        'Data': pd.to_datetime(['2024-01-01', None, '2024-02-01']),
+        'Status': ['PENDENTE', 'INVALIDO', None],
+        'Valor': [1.23456789, np.nan, 3.0]
+    })
+
+def test_sanitize_keeps_column_names_and_json_types():
+    registros = _sanitize(_sample_df())
+
+    assert [list(registro) for registro in registros] == [[2023, 'Data', 'Status', 'Valor']] * 3
+    assert registros[0] == {2023: 1.0, 'Data': '2024-01-01T00:00:00.000', 'Status': 'PENDENTE', 'Valor': 1.23456789}
+    assert registros[1]['Data'] is None and registros[1]['Valor'] is None
+    assert registros[2][2023] is None and registros[2]['Status'] is None
+
+def test_analisar_aba_report_is_json_safe():
+    df = _sample_df()
+
+    analise = AuditorDados().analisar_aba(df, 'ANA')
+
+    assert analise['tipos_dados'] == {col: str(dtype) for col, dtype in df.dtypes.items()}
+    assert all(list(registro) == analise['colunas'] for registro in analise['amostra_dados'])
+    assert list(analise['estatisticas']) == analise['colunas']
+    assert analise['estatisticas']['Valor']['mean'] == round(df['Valor'].mean(), 4)
+    # Only plain JSON types: dumps must not need a default= hook
+    json.dumps(analise)
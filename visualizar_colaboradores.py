@@ -34,7 +34,7 @@ def carregar_dados_colaborador(nome_arquivo, nome_aba):
     """
     try:
         # Carregar dados do colaborador
-        df = pd.read_excel(nome_arquivo, sheet_name=nome_aba)
+        df = pd.read_excel(nome_arquivo, sheet_name=nome_aba, engine='calamine')
         
         # Normalizar nomes das colunas
         colunas_normalizadas = []
@@ -184,7 +184,7 @@ def listar_colaboradores(nome_arquivo):
         list: Lista com os nomes das abas/colaboradores
     """
     try:
-        xls = pd.ExcelFile(nome_arquivo)
+        xls = pd.ExcelFile(nome_arquivo, engine='calamine')
         abas_validas = [aba for aba in xls.sheet_names if aba not in ["", "TESTE", "RELATÓRIO GERAL"]]
         return abas_validas
     except Exception as e: